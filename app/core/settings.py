@@ -12,6 +12,21 @@ class Settings(BaseSettings):
 
     REDIS_DOMAIN: str = "redis"
     REDIS_PORT: int = 6379
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: int = 5
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    RESULTS_EXPORT_CHUNK: int = 500
+    RESULTS_COMPRESS_THRESHOLD: int = 1024
+
+    EXPORT_DIR: str = "exports"
+    # Identical export requests within this window reuse the same job.
+    EXPORT_FRESHNESS: int = 600
+    EXPORT_RETENTION: int = 3600
+    EXPORT_CLEANUP_INTERVAL: int = 900
+    # Pending or running jobs without a heartbeat for this long count as failed.
+    EXPORT_STALE_AFTER: int = 300
 
     PORT: int = 8000
     HOST: str = "0.0.0.0"
@@ -26,9 +41,38 @@ class Settings(BaseSettings):
     ALGORITHM: str="algorithm"
     ISSUER: str = "ISSUER"
 
+    AUTH0_JWKS_TTL: int = 600
+    AUTH0_JWKS_MIN_REFETCH_INTERVAL: int = 30
+    AUTH0_JWKS_TIMEOUT: float = 5.0
+
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL: int = 300
+
+    HASH_MAX_WORKERS: int = 4
+
+    ANSWER_KEY_CACHE_SIZE: int = 1000
+    ANSWER_KEY_TTL: int = 24 * 3600
+
+    RESULT_WRITER_BATCH_SIZE: int = 100
+    RESULT_WRITER_MAX_LATENCY_MS: int = 10
+
+    PAGE_SIZE_DEFAULT: int = 20
+    PAGE_SIZE_MAX: int = 100
+
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_BACKEND_URL: str = "redis://localhost:6379/1"
 
+    NOTIFICATION_FANOUT_CHUNK: int = 1000
+    NOTIFICATION_FANOUT_RETRY_DELAY: int = 10
+
+    QUIZ_ATTEMPTS_FLUSH_INTERVAL: int = 60
+    POPULAR_QUIZZES_DEFAULT: int = 10
+    POPULAR_QUIZZES_MAX: int = 100
+
+    ANALYTICS_ROLLUP_INTERVAL: int = 300
+    # Results committed later than this after their create_at would be missed.
+    ANALYTICS_ROLLUP_LAG: int = 120
+
     @property
     def ASYNC_DATABASE_URL(self) -> str:
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
@@ -1,8 +1,53 @@
+from typing import Optional
+
 from app.core.settings import config
 from redis import asyncio as aioredis
 
-async def get_redis_client():
-    redis = await aioredis.from_url(
-        url=config.ASYNC_REDIS_URL, encoding="utf-8", decode_responses=True
-    )
-    return redis
+
+class RedisPoolManager:
+    def __init__(self, url: str):
+        self.url = url
+        self._pool: Optional[aioredis.BlockingConnectionPool] = None
+        self._client: Optional[aioredis.Redis] = None
+
+    @property
+    def client(self) -> aioredis.Redis:
+        if self._client is None:
+            self._pool = aioredis.BlockingConnectionPool.from_url(
+                self.url,
+                max_connections=config.REDIS_MAX_CONNECTIONS,
+                timeout=config.REDIS_POOL_TIMEOUT,
+                socket_timeout=config.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=config.REDIS_SOCKET_CONNECT_TIMEOUT,
+                health_check_interval=config.REDIS_HEALTH_CHECK_INTERVAL,
+                encoding="utf-8",
+                decode_responses=True,
+            )
+            self._client = aioredis.Redis(connection_pool=self._pool)
+        return self._client
+
+    async def start(self) -> None:
+        self.client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            await self._pool.disconnect()
+            self._client = None
+            self._pool = None
+
+    def stats(self) -> dict:
+        if self._pool is None:
+            return {"max_connections": config.REDIS_MAX_CONNECTIONS, "in_use": 0, "idle": 0}
+        return {
+            "max_connections": self._pool.max_connections,
+            "in_use": len(self._pool._in_use_connections),
+            "idle": len(self._pool._available_connections),
+        }
+
+
+redis_pool = RedisPoolManager(config.ASYNC_REDIS_URL)
+
+
+async def get_redis_client() -> aioredis.Redis:
+    return redis_pool.client
@@ -1,13 +1,29 @@
 from datetime import datetime
+from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel
 
 
 class AnalyticResponse(BaseModel):
+    quiz_name: Optional[str] = None
     last_attempt: datetime
     average_score: float
     score_percentage: int
 
+    class Config:
+        from_attributes = True
+
+class AnalyticResponseMember(BaseModel):
+    user_id: UUID
+    attempts: int
+    average_score: float
+    min_score: int
+    max_score: int
+
+    class Config:
+        from_attributes = True
+
+
 class AnalyticResponseUser(BaseModel):
     user_id: UUID
     quiz_id: UUID
@@ -88,6 +88,12 @@ class QuestionResponseSchema(BaseModel):
         from_attributes = True
 
 
+class PopularQuizResponse(BaseModel):
+    id: UUID
+    title: str
+    attempts: int
+
+
 class QuizResponseSchema(BaseModel):
     id: UUID
     title: str
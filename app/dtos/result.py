@@ -1,7 +1,10 @@
 from datetime import datetime
+from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel
 
+from app.entity.enums import ExportStatus
+
 
 class ResultSchema(BaseModel):
     question_id: UUID
@@ -18,3 +21,16 @@ class ResultResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ExportJobResponse(BaseModel):
+    id: UUID
+    status: ExportStatus
+    company_id: UUID
+    user_id: Optional[UUID] = None
+    quiz_id: Optional[UUID] = None
+    file_format: str
+    processed: int
+    total: int
+    error: Optional[str] = None
+    created_at: datetime
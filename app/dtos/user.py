@@ -30,3 +30,13 @@ class UserDetail(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class UserPrincipal(BaseModel):
+    id: UUID
+    username: str
+    email: str
+
+    class Config:
+        from_attributes = True
+        frozen = True
@@ -16,3 +16,10 @@ class ActionStatus(Enum):
     MEMBER = "member"
     OWNER = "owner"
     ADMIN = "admin"
+
+
+class ExportStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
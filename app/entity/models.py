@@ -1,75 +1,136 @@
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Enum, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.entity.base_models import Base
 from uuid import UUID
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
 
 from app.entity.enums import ActionStatus
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_create_at_id", "create_at", "id"),)
     username: Mapped[str] = mapped_column(String(50), nullable=False)
     email: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
     password: Mapped[str] = mapped_column(String(255), nullable=False)
-    actions:Mapped[list["Action"]] = relationship("Action", back_populates='user', lazy="selectin", cascade="all, delete-orphan")
-    results: Mapped[list["Result"]] = relationship("Result", back_populates="user", lazy="selectin", cascade="all, delete-orphan")
-    notifications: Mapped[list["Notification"]] = relationship("Notification", back_populates="user", lazy="selectin", cascade="all, delete-orphan")
+    actions:Mapped[list["Action"]] = relationship("Action", back_populates='user', lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
+    results: Mapped[list["Result"]] = relationship("Result", back_populates="user", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
+    notifications: Mapped[list["Notification"]] = relationship("Notification", back_populates="user", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
 
 class Company(Base):
     __tablename__ = "companies"
+    __table_args__ = (Index("ix_companies_create_at_id", "create_at", "id"),)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     is_visible: Mapped[bool] = mapped_column(Boolean, default=True)
-    actions: Mapped[list["Action"]] = relationship("Action", back_populates='company', lazy="selectin", cascade="all, delete-orphan")
-    quizzes: Mapped[list["Quiz"]] = relationship("Quiz", back_populates="company", cascade="all, delete-orphan")
+    actions: Mapped[list["Action"]] = relationship("Action", back_populates='company', lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
+    quizzes: Mapped[list["Quiz"]] = relationship("Quiz", back_populates="company", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
 
 class Action(Base):
     __tablename__ = "actions"
+    __table_args__ = (
+        UniqueConstraint("user_id", "company_id", name="uq_actions_user_id_company_id"),
+        Index("ix_actions_company_id_user_id_status", "company_id", "user_id", "status"),
+    )
     user_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     company_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
     status: Mapped[ActionStatus] = mapped_column('status', Enum(ActionStatus), default=None)
-    user: Mapped["User"] = relationship("User", back_populates="actions")
-    company: Mapped["Company"] = relationship("Company", back_populates="actions")
+    user: Mapped["User"] = relationship("User", back_populates="actions", lazy="raise")
+    company: Mapped["Company"] = relationship("Company", back_populates="actions", lazy="raise")
 
 class Quiz(Base):
     __tablename__ = "quizzes"
+    __table_args__ = (Index("ix_quizzes_company_id_create_at_id", "company_id", "create_at", "id"),)
     title: Mapped[str] = mapped_column(String(250), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     frequency: Mapped[int] = mapped_column(Integer, default=0)
     company_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
-    company: Mapped["Company"] = relationship("Company", back_populates="quizzes", lazy="selectin")
-    questions: Mapped[list["Question"]] = relationship("Question", back_populates="quiz", lazy="joined", cascade="all, delete-orphan")
-    results: Mapped["Result"] = relationship("Result", back_populates="quiz", lazy="selectin", cascade="all, delete-orphan")
+    company: Mapped["Company"] = relationship("Company", back_populates="quizzes", lazy="raise")
+    questions: Mapped[list["Question"]] = relationship("Question", back_populates="quiz", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
+    results: Mapped["Result"] = relationship("Result", back_populates="quiz", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (Index("ix_questions_quiz_id", "quiz_id"),)
     quiz_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("quizzes.id", ondelete="CASCADE"), nullable = False)
     title:Mapped[str] = mapped_column(String(200), nullable=False)
-    quiz: Mapped["Quiz"] = relationship("Quiz", back_populates="questions", lazy="selectin")
-    answers: Mapped[list["Answer"]] = relationship("Answer", back_populates="question", lazy="joined", cascade="all, delete-orphan")
+    quiz: Mapped["Quiz"] = relationship("Quiz", back_populates="questions", lazy="raise")
+    answers: Mapped[list["Answer"]] = relationship("Answer", back_populates="question", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
 
 class Answer(Base):
     __tablename__ = "answers"
+    __table_args__ = (Index("ix_answers_question_id_is_correct", "question_id", "is_correct"),)
     question_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("questions.id", ondelete="CASCADE"),nullable=False)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     is_correct: Mapped[bool] = mapped_column(Boolean, default=False)
-    question: Mapped["Question"] = relationship("Question", back_populates="answers", lazy="joined")
+    question: Mapped["Question"] = relationship("Question", back_populates="answers", lazy="raise")
 
 class Result(Base):
     __tablename__ = "results"
+    __table_args__ = (
+        Index("ix_results_user_id_quiz_id_create_at", "user_id", "quiz_id", "create_at"),
+        Index("ix_results_create_at", "create_at"),
+    )
     user_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     quiz_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
     correct_answers: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     total_questions: Mapped[int] = mapped_column(Integer, nullable=False)
     score_percentage: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
-    user:Mapped["User"] = relationship("User", back_populates="results", lazy="selectin")
-    quiz: Mapped["Quiz"] = relationship("Quiz", back_populates="results", lazy="selectin")
+    user:Mapped["User"] = relationship("User", back_populates="results", lazy="raise")
+    quiz: Mapped["Quiz"] = relationship("Quiz", back_populates="results", lazy="raise")
+    answers: Mapped[list["ResultAnswer"]] = relationship("ResultAnswer", back_populates="result", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
+
+class ResultAnswer(Base):
+    __tablename__ = "result_answers"
+    __table_args__ = (
+        Index("ix_result_answers_result_id", "result_id"),
+        Index("ix_result_answers_question_id_is_correct", "question_id", "is_correct"),
+    )
+    result_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("results.id", ondelete="CASCADE"), nullable=False)
+    question_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
+    answer_ids: Mapped[list[UUID]] = mapped_column(ARRAY(PGUUID(as_uuid=True)), nullable=False)
+    is_correct: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    result: Mapped["Result"] = relationship("Result", back_populates="answers", lazy="raise")
+
+class ResultAggregate(Base):
+    __tablename__ = "result_aggregates"
+    __table_args__ = (
+        UniqueConstraint("user_id", "company_id", "quiz_id", name="uq_result_aggregates_user_id_company_id_quiz_id"),
+    )
+    user_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    company_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+    quiz_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    score_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    last_attempt_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+
+class ResultDailyRollup(Base):
+    __tablename__ = "result_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("company_id", "day", "quiz_id", "user_id", name="uq_result_daily_rollups_company_id_day_quiz_id_user_id"),
+    )
+    company_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+    quiz_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
+    user_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    day: Mapped[Date] = mapped_column(Date, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    score_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    score_min: Mapped[int] = mapped_column(Integer, nullable=False)
+    score_max: Mapped[int] = mapped_column(Integer, nullable=False)
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+    name: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
+    processed_until: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_id_status", "user_id", "status"),
+        Index("ix_notifications_user_id_create_at_id", "user_id", "create_at", "id"),
+    )
     user_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True),ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     text: Mapped[str] = mapped_column(String, nullable=False)
     status: Mapped[bool] = mapped_column(Boolean, default=False)
-    user: Mapped["User"] = relationship("User", back_populates="notifications", lazy="selectin")
+    user: Mapped["User"] = relationship("User", back_populates="notifications", lazy="raise")
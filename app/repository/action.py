@@ -2,13 +2,14 @@ from typing import List, Optional
 from uuid import UUID
 
 from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased, joinedload
 
 from app.dtos.action import ActionDetail
 from app.dtos.user import UserDetail
 from app.entity.enums import ActionStatus
 from app.repository.base_repository import BaseRepository
 from app.entity.models import Action, User
+from app.utils.message_for_actions import Transition
 
 
 class ActionRepository(BaseRepository):
@@ -46,10 +47,10 @@ class ActionRepository(BaseRepository):
     async def get_users_by_company(
         self,
         company_id: UUID,
-        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
         limit: Optional[int] = None,
         admin: Optional[bool] = False,
-    ) -> List[UserDetail]:
+    ) -> dict:
         stmt = (
             select(User)
             .join(self.model, self.model.user_id == User.id)
@@ -63,12 +64,15 @@ class ActionRepository(BaseRepository):
         else:
             stmt = stmt.filter(self.model.status == ActionStatus.MEMBER)
 
-        if offset is not None and limit is not None:
-            stmt = stmt.offset(offset).limit(limit)
+        return await self.paginate(stmt, cursor, limit, entity=User)
 
-        results = await self.db.execute(stmt)
-        users = results.scalars().all()
-        return users
+    async def get_member_ids(self, company_id: UUID) -> List[UUID]:
+        stmt = select(self.model.user_id).filter(
+            self.model.company_id == company_id,
+            self.model.status == ActionStatus.MEMBER,
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
 
     async def is_user_owner_or_admin(self, company_id: UUID, user_id: UUID):
         stmt = select(self.model).filter(
@@ -87,3 +91,21 @@ class ActionRepository(BaseRepository):
         )
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
+
+    def managed_company_ids(self, user_id: UUID):
+        manager = aliased(self.model)
+        return select(manager.company_id).filter(
+            (manager.user_id == user_id)
+            & (manager.status.in_((ActionStatus.OWNER, ActionStatus.ADMIN)))
+        )
+
+    async def transition(
+        self, transition: Transition, params: dict, manager_id: Optional[UUID] = None
+    ) -> Optional[Action]:
+        criteria = [getattr(self.model, key) == value for key, value in params.items()]
+        criteria.append(self.model.status.in_(transition.allowed_from))
+        if manager_id:
+            criteria.append(
+                self.model.company_id.in_(self.managed_company_ids(manager_id))
+            )
+        return await self.update_where({"status": transition.to_status}, *criteria)
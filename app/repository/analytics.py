@@ -1,73 +1,169 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from uuid import UUID
-from sqlalchemy import and_, func, select
+from sqlalchemy import Date, Numeric, Text, and_, case, cast, func, select, update
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert as pg_insert
 from app.repository.base_repository import BaseRepository
-from app.entity.models import Result
+from app.entity.models import Quiz, Result, ResultDailyRollup, RollupWatermark
+
+DAILY_ROLLUP = "result_daily_rollups"
 
 
 class AnalyticsRepository(BaseRepository):
     def __init__(self, db):
         super().__init__(db=db, model=Result)
 
+    def running_average(self, *criteria):
+        order = (self.model.create_at, self.model.id)
+        average_score = func.avg(self.model.score_percentage).over(
+            order_by=order, rows=(None, 0)
+        )
+        return (
+            select(
+                Quiz.title.label("quiz_name"),
+                self.model.create_at.label("last_attempt"),
+                self.model.score_percentage,
+                func.round(cast(average_score, Numeric), 1).label("average_score"),
+            )
+            .join(Quiz, Quiz.id == self.model.quiz_id)
+            .filter(*criteria)
+            .order_by(*order)
+        )
+
     async def get_attempt_by_user(self, user_id: UUID):
-        stmt = select(self.model).filter(self.model.user_id == user_id)
+        stmt = self.running_average(self.model.user_id == user_id)
         result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return result.all()
 
     async def get_results_by_quiz(self, user_id: UUID, quiz_id: UUID):
-        stmt = select(self.model).filter(
+        stmt = self.running_average(
             self.model.user_id == user_id, self.model.quiz_id == quiz_id
         )
         result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return result.all()
 
     async def get_results_by_company(self, user_id: UUID, company_id: UUID):
-        stmt = (
-            select(self.model)
-            .join(self.model.quiz)
-            .filter(
-                self.model.user_id == user_id,
-                self.model.quiz.has(company_id=company_id),
-            )
+        stmt = self.running_average(
+            self.model.user_id == user_id, Quiz.company_id == company_id
         )
         result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return result.all()
 
     async def get_result_members_by_date(
-        self, from_date: datetime, to_date: datetime, company_id: UUID
+        self, from_date: date, to_date: date, company_id: UUID
     ):
+        rollup = ResultDailyRollup
         stmt = (
-            select(self.model)
-            .join(self.model.quiz)
+            select(
+                rollup.user_id,
+                func.sum(rollup.attempts).label("attempts"),
+                func.round(
+                    cast(func.sum(rollup.score_sum), Numeric) / func.sum(rollup.attempts), 1
+                ).label("average_score"),
+                func.min(rollup.score_min).label("min_score"),
+                func.max(rollup.score_max).label("max_score"),
+            )
             .filter(
-                and_(
-                    self.model.quiz.has(company_id=company_id),
-                    self.model.create_at >= from_date,
-                    self.model.create_at < to_date,
-                )
+                rollup.company_id == company_id,
+                rollup.day >= from_date,
+                rollup.day < to_date,
             )
-            .group_by(self.model.user_id)
+            .group_by(rollup.user_id)
         )
+        result = await self.db.execute(stmt)
+        return result.all()
 
+    async def lock_watermark(self, name: str) -> RollupWatermark:
+        await self.db.execute(
+            pg_insert(RollupWatermark)
+            .values(name=name, processed_until=datetime(1970, 1, 1))
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        stmt = select(RollupWatermark).filter_by(name=name).with_for_update()
         result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return result.scalar_one()
 
-    async def get_result_member_by_id(self, user_id: UUID, company_id: UUID):
-        stmt = (
-            select(self.model)
-            .join(self.model.quiz)
+    async def refresh_daily_rollups(self, lag: timedelta) -> int:
+        until = (await self.db.execute(select(func.localtimestamp()))).scalar() - lag
+        watermark = await self.lock_watermark(DAILY_ROLLUP)
+        if watermark.processed_until >= until:
+            await self.db.commit()
+            return 0
+
+        rollup = ResultDailyRollup
+        day = cast(self.model.create_at, Date)
+        rollup_id = cast(
+            func.md5(
+                cast(Quiz.company_id, Text)
+                + cast(self.model.quiz_id, Text)
+                + cast(self.model.user_id, Text)
+                + cast(day, Text)
+            ),
+            PGUUID(as_uuid=True),
+        )
+        source = (
+            select(
+                rollup_id,
+                Quiz.company_id,
+                self.model.quiz_id,
+                self.model.user_id,
+                day,
+                func.count(),
+                func.sum(self.model.score_percentage),
+                func.min(self.model.score_percentage),
+                func.max(self.model.score_percentage),
+            )
+            .join(Quiz, Quiz.id == self.model.quiz_id)
             .filter(
-                and_(
-                    self.model.quiz.has(company_id=company_id),
-                    self.model.user_id == user_id,
-                )
+                self.model.create_at >= watermark.processed_until,
+                self.model.create_at < until,
             )
+            .group_by(Quiz.company_id, self.model.quiz_id, self.model.user_id, day)
+        )
+        stmt = pg_insert(rollup).from_select(
+            [
+                "id",
+                "company_id",
+                "quiz_id",
+                "user_id",
+                "day",
+                "attempts",
+                "score_sum",
+                "score_min",
+                "score_max",
+            ],
+            source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["company_id", "day", "quiz_id", "user_id"],
+            set_={
+                "attempts": rollup.attempts + stmt.excluded.attempts,
+                "score_sum": rollup.score_sum + stmt.excluded.score_sum,
+                "score_min": case(
+                    (stmt.excluded.score_min < rollup.score_min, stmt.excluded.score_min),
+                    else_=rollup.score_min,
+                ),
+                "score_max": case(
+                    (stmt.excluded.score_max > rollup.score_max, stmt.excluded.score_max),
+                    else_=rollup.score_max,
+                ),
+                "update_at": func.now(),
+            },
         )
-
         result = await self.db.execute(stmt)
-        return result.scalars().all()
-
+        await self.db.execute(
+            update(RollupWatermark)
+            .filter_by(id=watermark.id)
+            .values(processed_until=until)
+        )
+        await self.db.commit()
+        return result.rowcount
 
+    async def get_result_member_by_id(self, user_id: UUID, company_id: UUID):
+        stmt = self.running_average(
+            Quiz.company_id == company_id, self.model.user_id == user_id
+        )
+        result = await self.db.execute(stmt)
+        return result.all()
 
     async def get_result_members_last_passing_time(self, company_id: UUID, quiz_id: UUID):
         stmt = (
@@ -1,9 +1,11 @@
 from typing import Optional, TypeVar
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import inspect, insert, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeMeta
+from app.repository.load_profiles import LOAD_PROFILES
 from app.services.errors import ErrorNotFound
+from app.utils.pagination import decode_cursor, encode_cursor, page_size
 
 ModelType = TypeVar("ModelType", bound=DeclarativeMeta)
 
@@ -14,17 +16,47 @@ class BaseRepository:
         self.db = db
         self.model = model
 
-    async def get_many(
-        self, offset: Optional[int] = None, limit: Optional[int] = None
-    ) -> list[ModelType]:
-        stmt = select(self.model)
-        if offset is not None and limit is not None:
-            stmt = stmt.offset(offset).limit(limit)
+    def with_profile(self, stmt, profile: Optional[str] = None):
+        if profile is None:
+            return stmt
+        return stmt.options(*LOAD_PROFILES[profile])
+
+    async def paginate(
+        self,
+        stmt,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        entity=None,
+    ) -> dict:
+        entity = entity or self.model
+        limit = page_size(limit)
+        if cursor:
+            stmt = stmt.filter(
+                tuple_(entity.create_at, entity.id) > tuple_(*decode_cursor(cursor))
+            )
+        stmt = stmt.order_by(entity.create_at, entity.id).limit(limit + 1)
         result = await self.db.execute(stmt)
-        return result.scalars().all()
+        items = result.unique().scalars().all()
+        if len(items) <= limit:
+            return {"items": items, "next_cursor": None}
+        items = items[:limit]
+        return {
+            "items": items,
+            "next_cursor": encode_cursor(items[-1].create_at, items[-1].id),
+        }
 
-    async def get_one(self, **params) -> ModelType:
-        query = select(self.model).filter_by(**params)
+    async def get_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        profile: Optional[str] = None,
+        **params,
+    ) -> dict:
+        stmt = self.with_profile(select(self.model).filter_by(**params), profile)
+        return await self.paginate(stmt, cursor, limit)
+
+    async def get_one(self, profile: Optional[str] = None, **params) -> ModelType:
+        query = self.with_profile(select(self.model).filter_by(**params), profile)
         result = await self.db.execute(query)
         db_row = result.unique().scalar_one_or_none()
         return db_row
@@ -36,20 +68,50 @@ class BaseRepository:
         await self.db.refresh(result)
         return result
 
-    async def update(self, id: UUID, body: dict) -> ModelType:
-        result = await self.get_one_or_404({"id": id})
-        for key, value in body.items():
-            if hasattr(result, key) and value is not None:
-                setattr(result, key, value)
+    async def update_where(self, body: dict, *criteria) -> Optional[ModelType]:
+        columns = inspect(self.model).column_attrs.keys()
+        values = {
+            key: value
+            for key, value in body.items()
+            if key in columns and value is not None
+        }
+        if not values:
+            result = await self.db.execute(select(self.model).where(*criteria))
+            return result.unique().scalar_one_or_none()
+        stmt = (
+            select(self.model)
+            .from_statement(
+                update(self.model)
+                .where(*criteria)
+                .values(**values)
+                .returning(self.model)
+            )
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.scalars(stmt)
+        instance = result.one_or_none()
         await self.db.commit()
-        await self.db.refresh(result)
+        return instance
+
+    async def update(self, id: UUID, body: dict, *criteria) -> ModelType:
+        result = await self.update_where(body, self.model.id == id, *criteria)
+        if result is None:
+            raise ErrorNotFound
         return result
 
-    async def update_many(self, instance: ModelType, body: dict) -> ModelType:
+    async def update_many(
+        self, instance: ModelType, body: dict, profile: Optional[str] = None
+    ) -> ModelType:
         await self.update_recursive(instance, body)
         await self.db.commit()
-        await self.db.refresh(instance)
-        return instance
+        return await self.reload(instance, profile)
+
+    async def reload(self, instance: ModelType, profile: Optional[str] = None):
+        stmt = self.with_profile(
+            select(self.model).filter_by(id=instance.id), profile
+        ).execution_options(populate_existing=True)
+        result = await self.db.execute(stmt)
+        return result.unique().scalar_one()
 
     async def update_recursive(self, instance: ModelType, body: dict):
         for key, value in body.items():
@@ -68,28 +130,36 @@ class BaseRepository:
         await self.db.commit()
         return result
 
-    async def get_one_or_404(self, params: dict) -> ModelType | None:
-        result = await self.get_one(**params)
+    async def get_one_or_404(
+        self, params: dict, profile: Optional[str] = None
+    ) -> ModelType | None:
+        result = await self.get_one(profile=profile, **params)
         if not result:
             raise ErrorNotFound
         return result
 
-    async def create_many(self, objects: list[ModelType]) -> list[ModelType]:
-        self.db.add_all(objects)
+    def to_row(self, obj: ModelType | dict) -> dict:
+        if isinstance(obj, dict):
+            return obj
+        return {
+            attr.key: obj.__dict__[attr.key]
+            for attr in inspect(self.model).column_attrs
+            if attr.key in obj.__dict__
+        }
+
+    async def create_many(self, objects: list[ModelType | dict]) -> list[ModelType]:
+        if not objects:
+            return []
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = await self.db.scalars(stmt, [self.to_row(obj) for obj in objects])
+        created = result.all()
         await self.db.commit()
-        for obj in objects:
-            await self.db.refresh(obj)
-        return objects
+        return created
 
     async def get_many_by_params(
-        self,
-        offset: Optional[int] = None,
-        limit: Optional[int] = None,
-        **params,
+        self, profile: Optional[str] = None, **params
     ) -> list[ModelType]:
-        stmt = select(self.model).filter_by(**params)
-        if offset is not None and limit is not None:
-            stmt = stmt.offset(offset).limit(limit)
+        stmt = self.with_profile(select(self.model).filter_by(**params), profile)
         result = await self.db.execute(stmt)
         return result.unique().scalars().all()
 
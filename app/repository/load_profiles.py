@@ -0,0 +1,13 @@
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.entity.models import Question, Quiz
+
+
+# Relationships are lazy="raise" by default; a repository query opts into
+# the graph it needs by naming one of these profiles.
+LOAD_PROFILES = {
+    "quiz_with_questions": (
+        selectinload(Quiz.questions).selectinload(Question.answers),
+    ),
+    "quiz_with_company": (joinedload(Quiz.company),),
+}
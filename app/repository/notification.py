@@ -1,3 +1,4 @@
+from typing import Optional
 from uuid import UUID
 
 from sqlalchemy import select
@@ -9,12 +10,14 @@ class NotificationRepository(BaseRepository):
     def __init__(self, db):
         super().__init__(db=db, model=Notification)
 
-    async def get_notifications(self, user_id: UUID):
+    async def get_notifications(
+        self, user_id: UUID, cursor: Optional[str] = None, limit: Optional[int] = None
+    ):
         stmt = select(self.model).filter(self.model.user_id == user_id)
-        result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return await self.paginate(stmt, cursor, limit)
 
-    async def get_unread_notification(self, user_id: UUID):
+    async def get_unread_notification(
+        self, user_id: UUID, cursor: Optional[str] = None, limit: Optional[int] = None
+    ):
         stmt = select(self.model).filter(self.model.user_id == user_id, self.model.status == False)
-        result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return await self.paginate(stmt, cursor, limit)
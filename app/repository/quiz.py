@@ -1,8 +1,83 @@
-from uuid import UUID
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert, select
+
+from app.dtos.quiz import QuizResponseSchema, QuizSchema
 from app.repository.base_repository import BaseRepository
 from app.entity.models import Answer, Question, Quiz
+from app.utils.answer_key import AnswerKey
 
 
 class QuizRepository(BaseRepository):
     def __init__(self, db):
         super().__init__(db=db, model=Quiz)
+
+    async def create_graph(self, company_id: UUID, body: QuizSchema) -> QuizResponseSchema:
+        quiz = {
+            "id": uuid4(),
+            "title": body.title,
+            "description": body.description,
+            "company_id": company_id,
+        }
+        questions, answers, response_questions = [], [], []
+        for question_data in body.questions:
+            question = {"id": uuid4(), "quiz_id": quiz["id"], "title": question_data.title}
+            question_answers = [
+                {
+                    "id": uuid4(),
+                    "question_id": question["id"],
+                    "title": answer_data.title,
+                    "is_correct": answer_data.is_correct,
+                }
+                for answer_data in question_data.answers
+            ]
+            questions.append(question)
+            answers.extend(question_answers)
+            response_questions.append({**question, "answers": question_answers})
+
+        await self.db.execute(insert(Quiz), [quiz])
+        await self.db.execute(insert(Question), questions)
+        await self.db.execute(insert(Answer), answers)
+        await self.db.commit()
+        return QuizResponseSchema.model_validate(
+            {**quiz, "questions": response_questions}
+        )
+
+    async def get_answer_key(self, quiz_id: UUID, version: str) -> AnswerKey:
+        stmt = (
+            select(Question.id, Question.title, Answer.id, Answer.title, Answer.is_correct)
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .where(Question.quiz_id == quiz_id)
+        )
+        result = await self.db.execute(stmt)
+
+        correct, question_titles, answer_titles = {}, {}, {}
+        for question_id, question_title, answer_id, answer_title, is_correct in result:
+            question_titles[question_id] = question_title
+            answers = answer_titles.setdefault(question_id, {})
+            correct.setdefault(question_id, set())
+            if answer_id is None:
+                continue
+            answers[answer_id] = answer_title
+            if is_correct:
+                correct[question_id].add(answer_id)
+
+        return AnswerKey(
+            quiz_id=quiz_id,
+            version=version,
+            correct={question_id: frozenset(ids) for question_id, ids in correct.items()},
+            question_titles=question_titles,
+            answer_titles=answer_titles,
+        )
+
+    async def get_titles(self, quiz_ids: list[UUID]) -> dict[UUID, str]:
+        stmt = select(self.model.id, self.model.title).where(self.model.id.in_(quiz_ids))
+        result = await self.db.execute(stmt)
+        return dict(result.all())
+
+    async def get_frequencies(self, company_id: UUID) -> dict[UUID, int]:
+        stmt = select(self.model.id, self.model.frequency).where(
+            self.model.company_id == company_id
+        )
+        result = await self.db.execute(stmt)
+        return dict(result.all())
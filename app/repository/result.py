@@ -1,13 +1,89 @@
+from typing import Optional
 from uuid import UUID
-from sqlalchemy import func, select
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.repository.base_repository import BaseRepository
-from app.entity.models import Quiz, Result
+from app.entity.models import Quiz, Result, ResultAggregate, ResultAnswer
 
 
 class ResultRepository(BaseRepository):
     def __init__(self, db):
         super().__init__(db=db, model=Result)
 
+    async def create_with_answers(
+        self, results: list[dict], answers: list[dict], company_ids: list[UUID]
+    ) -> list[Result]:
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        created = (await self.db.scalars(stmt, results)).all()
+        if answers:
+            await self.db.execute(insert(ResultAnswer), answers)
+        await self.upsert_aggregates(created, company_ids)
+        await self.db.commit()
+        return created
+
+    async def upsert_aggregates(self, results: list[Result], company_ids: list[UUID]):
+        aggregates = {}
+        for result, company_id in zip(results, company_ids):
+            key = (result.user_id, company_id, result.quiz_id)
+            attempts, score_sum, last_attempt_at = aggregates.get(
+                key, (0, 0, result.create_at)
+            )
+            aggregates[key] = (
+                attempts + 1,
+                score_sum + result.score_percentage,
+                max(last_attempt_at, result.create_at),
+            )
+        if not aggregates:
+            return
+
+        stmt = pg_insert(ResultAggregate)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "company_id", "quiz_id"],
+            set_={
+                "attempts": ResultAggregate.attempts + stmt.excluded.attempts,
+                "score_sum": ResultAggregate.score_sum + stmt.excluded.score_sum,
+                "last_attempt_at": case(
+                    (
+                        stmt.excluded.last_attempt_at > ResultAggregate.last_attempt_at,
+                        stmt.excluded.last_attempt_at,
+                    ),
+                    else_=ResultAggregate.last_attempt_at,
+                ),
+                "update_at": func.now(),
+            },
+        )
+        await self.db.execute(
+            stmt,
+            [
+                {
+                    "user_id": user_id,
+                    "company_id": company_id,
+                    "quiz_id": quiz_id,
+                    "attempts": attempts,
+                    "score_sum": score_sum,
+                    "last_attempt_at": last_attempt_at,
+                }
+                for (user_id, company_id, quiz_id), (
+                    attempts,
+                    score_sum,
+                    last_attempt_at,
+                ) in aggregates.items()
+            ],
+        )
+
+    async def get_average_score(
+        self, user_id: UUID, company_id: Optional[UUID] = None
+    ) -> Optional[float]:
+        stmt = select(
+            func.sum(ResultAggregate.score_sum), func.sum(ResultAggregate.attempts)
+        ).where(ResultAggregate.user_id == user_id)
+        if company_id:
+            stmt = stmt.where(ResultAggregate.company_id == company_id)
+        score_sum, attempts = (await self.db.execute(stmt)).one()
+        if not attempts:
+            return None
+        return score_sum / attempts
+
     async def get_results_by_user_and_company(self, user_id: UUID, company_id: UUID):
         stmt = (
             select(self.model)
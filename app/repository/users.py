@@ -1,3 +1,8 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from app.dtos.user import UserPrincipal
 from app.repository.base_repository import BaseRepository
 from app.entity.models import User
 
@@ -5,3 +10,28 @@ from app.entity.models import User
 class UserRepository(BaseRepository):
     def __init__(self, db):
         super().__init__(db=db, model=User)
+
+    async def get_principal(self, email: str) -> Optional[UserPrincipal]:
+        stmt = select(self.model.id, self.model.username, self.model.email).filter(
+            self.model.email == email
+        )
+        result = await self.db.execute(stmt)
+        row = result.one_or_none()
+        return UserPrincipal.model_validate(row) if row else None
+
+    async def provision_principal(
+        self, email: str, username: str, password: str
+    ) -> UserPrincipal:
+        stmt = (
+            insert(self.model)
+            .values(username=username, email=email, password=password)
+            .on_conflict_do_nothing(index_elements=[self.model.email])
+            .returning(self.model.id, self.model.username, self.model.email)
+        )
+        result = await self.db.execute(stmt)
+        row = result.one_or_none()
+        await self.db.commit()
+        if row is None:
+            # A concurrent request provisioned the same account first.
+            return await self.get_principal(email)
+        return UserPrincipal.model_validate(row)
@@ -1,10 +1,14 @@
-from datetime import datetime
+from datetime import date
 from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.db import get_db
-from app.dtos.analytics import AnalyticResponse, AnalyticResponseUser
+from app.dtos.analytics import (
+    AnalyticResponse,
+    AnalyticResponseMember,
+    AnalyticResponseUser,
+)
 from app.entity.models import User
 from app.repository.action import ActionRepository
 from app.repository.quiz import QuizRepository
@@ -62,10 +66,12 @@ async def analytics_average_score_user_in_system_by_company(
     )
 
 
-@router.get("/members/{from_date}/{to_date}")
+@router.get(
+    "/members/{from_date}/{to_date}", response_model=list[AnalyticResponseMember]
+)
 async def analytics_average_score_members_in_company_by_date(
-    from_date: datetime,
-    to_date: datetime,
+    from_date: date,
+    to_date: date,
     company_id: UUID,
     current_user: User = Depends(AuthService.get_current_user),
     analytics_service: AnalyticsService = Depends(get_analytics_service),
@@ -87,7 +93,7 @@ async def analytics_members_last_passing_time(
     )
 
 
-@router.get("/members/{user_id}")
+@router.get("/members/{user_id}", response_model=list[AnalyticResponse])
 async def analytics_average_score_member_in_company_by_id(
     user_id: UUID,
     company_id: UUID,
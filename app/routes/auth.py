@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.db import get_db
-from app.dtos.user import UserDetail, UserSchema, UserLogin
+from app.dtos.user import UserDetail, UserPrincipal, UserSchema, UserLogin
 from app.repository.users import UserRepository
 from app.services.auth import AuthService
 from app.dtos.auth import TokenSchema
@@ -30,5 +30,8 @@ async def login(
 
 
 @router.get("/me", response_model=UserDetail)
-async def user_me(current_user: UserDetail = Depends(AuthService.get_current_user)):
-    return current_user
+async def user_me(
+    current_user: UserPrincipal = Depends(AuthService.get_current_user),
+    auth_service=Depends(get_auth_service),
+):
+    return await auth_service.get_user_by_email(current_user.email)
@@ -6,13 +6,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.db import get_db
 from app.dtos.action import ActionDetail
 from app.dtos.company import CompanyDetail, CompanySchema, CompanyUpdate
+from app.dtos.pagination import Page
 from app.dtos.user import UserDetail
 from app.entity.models import User
 from app.repository.action import ActionRepository
 from app.repository.company import CompanyRepository
 from app.services.auth import AuthService
 from app.services.company import CompanyService
-from app.services.user import UserService
 
 router = APIRouter(prefix="/company", tags=["company"])
 
@@ -23,13 +23,13 @@ async def get_company_service(db: AsyncSession = Depends(get_db)):
     return CompanyService(db, user_repository, action_repository)
 
 
-@router.get("/", response_model=list[CompanyDetail])
+@router.get("/", response_model=Page[CompanyDetail])
 async def get_companies(
-    offset: Optional[int] = None,
+    cursor: Optional[str] = None,
     limit: Optional[int] = None,
     company_service=Depends(get_company_service),
 ):
-    return await company_service.get_all_companies(offset, limit)
+    return await company_service.get_all_companies(cursor, limit)
 
 
 @router.get("/{company_id}", response_model=CompanyDetail)
@@ -87,17 +87,17 @@ async def view_requests(
     return await action_service.get_company_requests_to_users(company_id, current_user)
 
 
-@router.get("/companies/{company_id}/members")
+@router.get("/companies/{company_id}/members", response_model=Page[UserDetail])
 async def view_users_in_company(
     company_id: UUID,
-    offset: Optional[int] = None,
+    cursor: Optional[str] = None,
     limit: Optional[int] = None,
     current_id: User = Depends(AuthService.get_current_user),
-    action_service: UserService = Depends(get_company_service),
-) -> list[UserDetail]:
+    action_service: CompanyService = Depends(get_company_service),
+):
     return await action_service.get_users_in_company(
         company_id,
         current_id,
-        offset,
+        cursor,
         limit,
     )
@@ -4,7 +4,11 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.db import get_db
-from app.database.redis_connector import get_redis_client
+from app.database.redis_connector import get_redis_client, redis_pool
+from app.utils.answer_key import answer_key_cache
+from app.utils.hash_password import Hash
+from app.utils.result_writer import result_writer
+from app.utils.token_cache import token_cache
 
 from logging_config import logger_decorator
 
@@ -41,3 +45,14 @@ async def read_root(redis: aioredis.Redis = Depends(get_redis_client)):
     await redis.set("mykey", "value")
     value = await redis.get("mykey")
     return {"message": f"Value from Redis: {value}"}
+
+
+@router.get("/metrics")
+async def metrics():
+    return {
+        "token_cache": token_cache.stats(),
+        "password_hashing": Hash.stats(),
+        "answer_key_cache": answer_key_cache.stats(),
+        "result_writer": result_writer.stats(),
+        "redis_pool": redis_pool.stats(),
+    }
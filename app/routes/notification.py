@@ -1,8 +1,10 @@
+from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.db import get_db
 from app.dtos.notification import NotificationResponse
+from app.dtos.pagination import Page
 from app.entity.models import User
 from app.repository.notification import NotificationRepository
 from app.services.auth import AuthService
@@ -17,22 +19,30 @@ async def get_notification_service(db: AsyncSession = Depends(get_db)):
     return NotificationService(db, notification_repository)
 
 
-@router.get("/all", response_model=list[NotificationResponse])
+@router.get("/all", response_model=Page[NotificationResponse])
 async def get_all_notifications_user(
     user_id: UUID,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
     current_user: User = Depends(AuthService.get_current_user),
     notification_service: NotificationService = Depends(get_notification_service),
 ):
-    return await notification_service.get_all_notifications(user_id, current_user)
+    return await notification_service.get_all_notifications(
+        user_id, current_user, cursor, limit
+    )
 
 
-@router.get("/unread", response_model=list[NotificationResponse])
+@router.get("/unread", response_model=Page[NotificationResponse])
 async def get_unread_notification_user(
     user_id: UUID,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
     current_user: User = Depends(AuthService.get_current_user),
     notification_service: NotificationService = Depends(get_notification_service),
 ):
-    return await notification_service.get_unread_notification(user_id, current_user)
+    return await notification_service.get_unread_notification(
+        user_id, current_user, cursor, limit
+    )
 
 
 @router.put("/read", response_model=NotificationResponse)
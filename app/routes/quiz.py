@@ -1,9 +1,16 @@
+from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.db import get_db
-from app.dtos.quiz import QuizResponseSchema, QuizSchema, QuizUpdate
+from app.dtos.pagination import Page
+from app.dtos.quiz import (
+    PopularQuizResponse,
+    QuizResponseSchema,
+    QuizSchema,
+    QuizUpdate,
+)
 from app.entity.models import User
 from app.repository.action import ActionRepository
 from app.repository.answer import AnswerRepository
@@ -35,13 +42,27 @@ async def get_quiz_service(db: AsyncSession = Depends(get_db)):
     )
 
 
-@router.get("/", response_model=list[QuizResponseSchema])
+@router.get("/", response_model=Page[QuizResponseSchema])
 async def get_quizzes_company(
     company_id: UUID,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
     current_user: User = Depends(AuthService.get_current_user),
     quiz_service=Depends(get_quiz_service),
 ):
-    return await quiz_service.get_quizzes_company(company_id, current_user)
+    return await quiz_service.get_quizzes_company(
+        company_id, current_user, cursor, limit
+    )
+
+
+@router.get("/popular", response_model=list[PopularQuizResponse])
+async def get_popular_quizzes(
+    company_id: UUID,
+    limit: Optional[int] = None,
+    current_user: User = Depends(AuthService.get_current_user),
+    quiz_service=Depends(get_quiz_service),
+):
+    return await quiz_service.get_popular_quizzes(company_id, current_user, limit)
 
 
 @router.post("/", response_model=QuizResponseSchema)
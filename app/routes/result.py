@@ -1,10 +1,10 @@
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.db import get_db
-from app.dtos.result import ResultResponse, ResultSchema
+from app.dtos.result import ExportJobResponse, ResultResponse, ResultSchema
 from app.entity.models import User
 from app.repository.action import ActionRepository
 from app.repository.answer import AnswerRepository
@@ -90,3 +90,36 @@ async def member_results(
     return await result_service.download_member_results(
         company_id, current_user, file_format, user_id, quiz_id
     )
+
+
+@router.post("/member/export", response_model=ExportJobResponse)
+async def create_export_job(
+    company_id: UUID,
+    file_format: str,
+    user_id: Optional[UUID] = None,
+    quiz_id: Optional[UUID] = None,
+    current_user=Depends(AuthService.get_current_user),
+    result_service: ResultService = Depends(get_result_service),
+):
+    return await result_service.create_export_job(
+        company_id, current_user, file_format, user_id, quiz_id
+    )
+
+
+@router.get("/export/{job_id}", response_model=ExportJobResponse)
+async def get_export_job(
+    job_id: UUID,
+    current_user=Depends(AuthService.get_current_user),
+    result_service: ResultService = Depends(get_result_service),
+):
+    return await result_service.get_export_job(job_id, current_user)
+
+
+@router.get("/export/{job_id}/download")
+async def download_export(
+    job_id: UUID,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    current_user=Depends(AuthService.get_current_user),
+    result_service: ResultService = Depends(get_result_service),
+):
+    return await result_service.download_export(job_id, current_user, range_header)
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.db import get_db
 from app.dtos.action import ActionDetail
+from app.dtos.pagination import Page
 from app.dtos.user import UserDetail, UserSchema, UserUpdate
 from app.entity.models import User
 from app.repository.action import ActionRepository
@@ -40,13 +41,13 @@ async def view_user_invitations(
     return await action_service.get_users_invitations_from_companies(current_user.id)
 
 
-@router.get("/", response_model=list[UserDetail])
+@router.get("/", response_model=Page[UserDetail])
 async def get_users(
-    offset: Optional[int] = None,
+    cursor: Optional[str] = None,
     limit: Optional[int] = None,
     user_service=Depends(get_user_service),
 ):
-    return await user_service.get_all_users(offset, limit)
+    return await user_service.get_all_users(cursor, limit)
 
 
 @router.get("/{user_id}", response_model=UserDetail)
@@ -1,4 +1,6 @@
+from typing import Optional
 from uuid import UUID
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dtos.action import ActionDetail
@@ -7,18 +9,10 @@ from app.entity.models import User
 from app.repository.action import ActionRepository
 from app.services.errors import UserForbidden
 from app.utils.message_for_actions import (
-    accept_invitation_status_msg,
-    accept_request_status_msg,
-    cancel_invitation_status_msg,
-    cancel_request_status_msg,
-    create_admin_status_msg,
-    decline_invitation_status_msg,
-    decline_request_status_msg,
-    leave_company_status_msg,
-    remove_admin_status_msg,
-    remove_user_status_msg,
-    request_to_join_status_msg,
-    send_invitation_status_msg,
+    REQUEST_TO_JOIN_MESSAGES,
+    SEND_INVITATION_MESSAGES,
+    TRANSITIONS,
+    status_error,
 )
 
 
@@ -28,6 +22,25 @@ class ActionService:
         self.db = db
         self.repository = repository
 
+    async def apply_transition(
+        self, name: str, params: dict, manager: Optional[User] = None
+    ) -> ActionDetail:
+        transition = TRANSITIONS[name]
+        manager_id = manager.id if manager else None
+        action = await self.repository.transition(transition, params, manager_id)
+        if action:
+            return action
+
+        action = await self.repository.get_one_or_404(params)
+        if manager and not await self.repository.is_user_owner_or_admin(
+            action.company_id, manager.id
+        ):
+            raise UserForbidden
+        raise status_error(transition.messages, action.status) or HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Action was changed, try again",
+        )
+
     # C to U
     async def send_invitation(
         self, company_id: UUID, user_id: UUID, current_user: User
@@ -47,50 +60,29 @@ class ActionService:
             )
             return await self.repository.create(action)
 
-        await send_invitation_status_msg(user_action)
+        error = status_error(SEND_INVITATION_MESSAGES, user_action.status)
+        if error:
+            raise error
 
     async def cancel_invitation(
         self, invitation_id: UUID, current_user: User
     ) -> ActionDetail:
-        action = await self.repository.get_one_or_404({"id": invitation_id})
-
-        if not await self.repository.is_user_owner_or_admin(
-            action.company_id, current_user.id
-        ):
-            raise UserForbidden
-
-        await cancel_invitation_status_msg(action)
-        return await self.repository.update(
-            action.id, {"status": ActionStatus.INVITATION_CANCELLED}
+        return await self.apply_transition(
+            "cancel_invitation", {"id": invitation_id}, manager=current_user
         )
 
     async def accept_request(
         self, request_id: UUID, current_user: User
     ) -> ActionDetail:
-        action = await self.repository.get_one_or_404({"id": request_id})
-
-        if not await self.repository.is_user_owner_or_admin(
-            action.company_id, current_user.id
-        ):
-            raise UserForbidden
-
-        await accept_invitation_status_msg(action)
-        return await self.repository.update(action.id, {"status": ActionStatus.MEMBER})
+        return await self.apply_transition(
+            "accept_request", {"id": request_id}, manager=current_user
+        )
 
     async def decline_request(
         self, invitation_id: UUID, current_user: User
     ) -> ActionDetail:
-        action = await self.repository.get_one_or_404({"id": invitation_id})
-
-        if not await self.repository.is_user_owner_or_admin(
-            action.company_id, current_user.id
-        ):
-            raise UserForbidden
-
-        await decline_invitation_status_msg(action)
-
-        return await self.repository.update(
-            action.id, {"status": ActionStatus.REQUEST_DECLINED}
+        return await self.apply_transition(
+            "decline_request", {"id": invitation_id}, manager=current_user
         )
 
     # U to C
@@ -108,93 +100,59 @@ class ActionService:
             )
             return await self.repository.create(action)
 
-        await request_to_join_status_msg(action)
+        error = status_error(REQUEST_TO_JOIN_MESSAGES, user_action.status)
+        if error:
+            raise error
 
     async def cancel_request(
         self, request_id: UUID, current_user: User
     ) -> ActionDetail:
-        action = await self.repository.get_one_or_404(
-            {"id": request_id, "user_id": current_user.id}
-        )
-
-        await cancel_request_status_msg(action)
-
-        return await self.repository.update(
-            action.id, {"status": ActionStatus.REQUEST_CANCELLED}
+        return await self.apply_transition(
+            "cancel_request", {"id": request_id, "user_id": current_user.id}
         )
 
     async def accept_invitation(
         self, invitation_id: UUID, current_user: User
     ) -> ActionDetail:
-        action = await self.repository.get_one_or_404(
-            {"id": invitation_id, "user_id": current_user.id}
+        return await self.apply_transition(
+            "accept_invitation", {"id": invitation_id, "user_id": current_user.id}
         )
-        await accept_request_status_msg(action)
-
-        return await self.repository.update(action.id, {"status": ActionStatus.MEMBER})
 
     async def decline_invitation(
         self, request_id: UUID, current_user: User
     ) -> ActionDetail:
-        action = await self.repository.get_one_or_404(
-            {"id": request_id, "user_id": current_user.id}
-        )
-
-        await decline_request_status_msg(action)
-
-        return await self.repository.update(
-            action.id, {"status": ActionStatus.INVITATION_DECLINED}
+        return await self.apply_transition(
+            "decline_invitation", {"id": request_id, "user_id": current_user.id}
         )
 
     async def remove_user(
         self, user_id: UUID, company_id: UUID, current_user: User
     ) -> ActionDetail:
-        if not await self.repository.is_user_owner_or_admin(
-            company_id, current_user.id
-        ):
-            raise UserForbidden
-
-        action = await self.repository.get_one_or_404(
-            {"user_id": user_id, "company_id": company_id}
+        return await self.apply_transition(
+            "remove_user",
+            {"user_id": user_id, "company_id": company_id},
+            manager=current_user,
         )
-        await remove_user_status_msg(action)
-        return await self.repository.update(action.id, {"status": ActionStatus.REMOVED})
 
     async def leave_company(self, company_id: UUID, current_user: User) -> ActionDetail:
-        user_action = await self.repository.get_one_or_404(
-            {"user_id": current_user.id, "company_id": company_id}
-        )
-        await leave_company_status_msg(user_action)
-        return await self.repository.update(
-            user_action.id, {"status": ActionStatus.LEFT}
+        return await self.apply_transition(
+            "leave_company", {"user_id": current_user.id, "company_id": company_id}
         )
 
     async def create_admin(
         self, company_id: UUID, user_id: UUID, current_user: User
     ) -> ActionDetail:
-        if not await self.repository.is_user_owner_or_admin(
-            company_id, current_user.id
-        ):
-            raise UserForbidden
-        user_action = await self.repository.get_one(
-            user_id=user_id, company_id=company_id
-        )
-        await create_admin_status_msg(user_action)
-        return await self.repository.update(
-            user_action.id, {"status": ActionStatus.ADMIN}
+        return await self.apply_transition(
+            "create_admin",
+            {"user_id": user_id, "company_id": company_id},
+            manager=current_user,
         )
 
     async def remove_admin(
         self, company_id: UUID, user_id: UUID, current_user: User
     ) -> ActionDetail:
-        if not await self.repository.is_user_owner_or_admin(
-            company_id, current_user.id
-        ):
-            raise UserForbidden
-        user_action = await self.repository.get_one(
-            user_id=user_id, company_id=company_id
-        )
-        await remove_admin_status_msg(user_action)
-        return await self.repository.update(
-            user_action.id, {"status": ActionStatus.MEMBER}
+        return await self.apply_transition(
+            "remove_admin",
+            {"user_id": user_id, "company_id": company_id},
+            manager=current_user,
         )
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -26,22 +26,6 @@ class AnalyticsService:
         self.result_repository = (result_repository,)
         self.action_repository = action_repository
 
-    async def calculation_result(self, list):
-        total_score = 0
-        list_attempts = []
-
-        for quiz in list:
-            total_score += quiz.score_percentage
-            list_attempts.append(
-                {
-                    "last_attempt": quiz.create_at,
-                    "average_score": round(total_score / (len(list_attempts) + 1), 1),
-                    "score_percentage": quiz.score_percentage,
-                }
-            )
-
-        return list_attempts
-
     async def get_analytics_user_by_all_quizzes(
         self,
         user_id: UUID,
@@ -51,7 +35,7 @@ class AnalyticsService:
             raise UserForbidden
 
         attempts = await self.repository.get_attempt_by_user(user_id)
-        return await self.calculation_result(attempts)
+        return attempts
 
     async def get_analytics_user_by_quiz(
         self, user_id: UUID, quiz_id: UUID, current_user: User
@@ -60,7 +44,7 @@ class AnalyticsService:
             raise UserForbidden
 
         attempts = await self.repository.get_results_by_quiz(user_id, quiz_id)
-        return await self.calculation_result(attempts)
+        return attempts
 
     async def get_analytics_user_by_company(
         self, user_id: UUID, company_id: UUID, current_user: User
@@ -69,12 +53,12 @@ class AnalyticsService:
             raise UserForbidden
 
         attempts = await self.repository.get_results_by_company(user_id, company_id)
-        return await self.calculation_result(attempts)
+        return attempts
 
     async def get_analytics_members_by_date(
         self,
-        from_date: datetime,
-        to_date: datetime,
+        from_date: date,
+        to_date: date,
         company_id: UUID,
         current_user: User,
     ):
@@ -86,7 +70,7 @@ class AnalyticsService:
         members_result = await self.repository.get_result_members_by_date(
             from_date, to_date, company_id
         )
-        return await self.calculation_result(members_result)
+        return members_result
 
     async def get_analytics_member_by_id(
         self,
@@ -103,7 +87,7 @@ class AnalyticsService:
             user_id, company_id
         )
 
-        return await self.calculation_result(member_result)
+        return member_result
 
     async def get_analytics_members_last_passing_time(
         self,
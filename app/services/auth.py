@@ -1,16 +1,15 @@
-from datetime import datetime
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.db import get_db
-from app.dtos.user import UserSchema
+from app.dtos.user import UserPrincipal, UserSchema
 from app.entity.models import User
 from app.repository.users import UserRepository
 from app.services.user import UserService
 from app.utils.auth import Auth
 from app.utils.hash_password import Hash
+from app.utils.token_cache import token_cache
 
 
 security = HTTPBearer()
@@ -25,12 +24,17 @@ class AuthService:
     async def get_current_user(
         credentials: HTTPAuthorizationCredentials = Depends(security),
         db: AsyncSession = Depends(get_db),
-    ):
+    ) -> UserPrincipal:
         token = credentials.credentials
-        email, token_source = await Auth.get_current_user_with_token(token)
+        user = token_cache.get(token)
+        if user is not None:
+            return user
 
-        user = await db.execute(select(User).where(User.email == email))
-        user = user.scalar_one_or_none()
+        email, token_source, expires_at = await Auth.get_current_user_with_token(
+            token
+        )
+
+        user = await UserRepository(db).get_principal(email)
 
         if user is None:
             if token_source == "own_service":
@@ -40,15 +44,13 @@ class AuthService:
                     headers={"WWW-Authenticate": "Bearer"},
                 )
             elif token_source == "auth0":
-                user = User(
-                    username=email.split("@")[0],
+                user = await UserRepository(db).provision_principal(
                     email=email,
-                    password=await Hash.get_password_hash(str(datetime.now())),
+                    username=email.split("@")[0],
+                    password=Hash.UNUSABLE_PASSWORD,
                 )
-                db.add(user)
-                await db.commit()
-                await db.refresh(user)
 
+        token_cache.set(token, user, expires_at)
         return user
 
     async def get_user_by_email(self, email: str):
@@ -4,6 +4,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dtos.action import ActionDetail
 from app.dtos.company import CompanyDetail, CompanySchema, CompanyUpdate
+from app.dtos.pagination import Page
+from app.dtos.user import UserDetail
 from app.entity.enums import ActionStatus
 from app.entity.models import User
 from app.repository.action import ActionRepository
@@ -28,9 +30,9 @@ class CompanyService:
         return company
 
     async def get_all_companies(
-        self, offset: Optional[int] = None, limit: Optional[int] = None
-    ) -> list[CompanyDetail]:
-        return await self.repository.get_many_with_is_visible(offset, limit)
+        self, cursor: Optional[str] = None, limit: Optional[int] = None
+    ) -> Page[CompanyDetail]:
+        return await self.repository.get_many_with_is_visible(cursor, limit)
 
     async def get_one_company(self, company_id: UUID) -> CompanyDetail:
         return await self.repository.get_one_or_404({"id": company_id})
@@ -75,3 +77,18 @@ class CompanyService:
         ):
             raise UserForbidden
         return await self.action_repository.get_requests(company_id)
+
+    async def get_users_in_company(
+        self,
+        company_id: UUID,
+        current_user: User,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[UserDetail]:
+        if not await self.action_repository.is_user_owner_or_admin(
+            company_id, current_user.id
+        ):
+            raise UserForbidden
+        return await self.action_repository.get_users_by_company(
+            company_id, cursor, limit
+        )
@@ -1,7 +1,8 @@
+from typing import Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.entity.models import User
+from app.entity.models import Notification, User
 from app.repository.notification import NotificationRepository
 from app.services.errors import UserForbidden
 
@@ -11,22 +12,33 @@ class NotificationService:
         self.db = db
         self.repository = repository
 
-    async def get_all_notifications(self, user_id: UUID, current_user: User):
+    async def get_all_notifications(
+        self,
+        user_id: UUID,
+        current_user: User,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ):
         if user_id != current_user.id:
             raise UserForbidden
-        return await self.repository.get_notifications(user_id)
+        return await self.repository.get_notifications(user_id, cursor, limit)
 
     async def read_notification(
         self, user_id: UUID, notification_id: UUID, current_user: User
     ):
         if user_id != current_user.id:
             raise UserForbidden
-        notification = await self.repository.get_one_or_404(
-            {"user_id": user_id, "id": notification_id}
+        return await self.repository.update(
+            notification_id, {"status": True}, Notification.user_id == user_id
         )
-        return await self.repository.update(notification.id, {"status": True})
 
-    async def get_unread_notification(self, user_id:UUID, current_user:User):
+    async def get_unread_notification(
+        self,
+        user_id: UUID,
+        current_user: User,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ):
         if user_id != current_user.id:
             raise UserForbidden
-        return await self.repository.get_unread_notification(user_id)
+        return await self.repository.get_unread_notification(user_id, cursor, limit)
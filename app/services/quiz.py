@@ -1,14 +1,21 @@
+from typing import Optional
 from uuid import UUID
-from sqlalchemy import select
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dtos.quiz import QuestionSchema, QuizSchema, QuizUpdate
-from app.entity.models import Answer, Notification, User
+from app.core.settings import config
+from app.dtos.quiz import QuizSchema, QuizUpdate
+from app.entity.models import User
 from app.repository.action import ActionRepository
 from app.repository.answer import AnswerRepository
 from app.repository.company import CompanyRepository
 from app.repository.notification import NotificationRepository
 from app.repository.question import QuestionRepository
 from app.repository.quiz import QuizRepository
+from app.services.errors import UserForbidden
+from app.utils.answer_key import answer_key_cache
+from app.utils.celery_worker import fan_out_quiz_notifications
+from app.utils.redis import Redis
 
 
 class QuizService:
@@ -31,60 +38,62 @@ class QuizService:
         self.notification_repository = notification_repository
         self.company_repository = company_repository
 
-    async def create_question_with_answers(self, quiz_id: UUID, question_data: QuestionSchema):
-        question_dict = {
-            "quiz_id": quiz_id,
-            "title": question_data.title,
-        }
-        created_question = await self.question_repository.create(question_dict)
-
-        answer_mappings = [
-            Answer(
-                question_id=created_question.id,
-                title=answer_data.title,
-                is_correct=answer_data.is_correct,
-            )
-            for answer_data in question_data.answers
-        ]
-
-        await self.answer_repository.create_many(answer_mappings)
-        return created_question
-
     async def create_quiz(self, company_id: UUID, body: QuizSchema, current_user: User):
         await self.action_repository.is_user_owner_or_admin(company_id, current_user.id)
-        quiz_data = body.model_dump(exclude={"questions"})
-        quiz_data["company_id"] = company_id
-        quiz = await self.repository.create(quiz_data)
-
-        for question_data in body.questions:
-            await self.create_question_with_answers(quiz.id, question_data)
-
-        result = []
-        users = await self.action_repository.get_users_by_company(company_id)
-        company = await self.company_repository.get_one_or_404({"id": company_id})
-        for user in users:
-            notification = Notification(
-                user_id=user.id,
-                text=f"Новий квіз {quiz.title} від компанії {company.name}",
-            )
+        quiz = await self.repository.create_graph(company_id, body)
 
-            result.append(notification)
-        await self.notification_repository.create_many(result)
-
-        await self.db.commit()
-        await self.db.refresh(quiz)
+        await run_in_threadpool(fan_out_quiz_notifications.delay, str(quiz.id))
         return quiz
 
     async def change_quiz(self, quiz_id:UUID, body:QuizUpdate, current_user: User):
-        quiz = await self.repository.get_one_or_404({"id": quiz_id})
+        quiz = await self.repository.get_one_or_404(
+            {"id": quiz_id}, profile="quiz_with_questions"
+        )
         await self.action_repository.is_user_owner_or_admin(quiz.company_id, current_user.id)
-        return await self.repository.update_many(quiz, body.model_dump(exclude_unset=True))
+        # Bumping update_at changes the answer key version seen by every worker.
+        quiz = await self.repository.update_many(
+            quiz,
+            {**body.model_dump(exclude_unset=True), "update_at": func.now()},
+            profile="quiz_with_questions",
+        )
+        await answer_key_cache.invalidate(quiz.id)
+        return quiz
 
     async def delete_quiz(self, quiz_id:UUID, current_user: User):
         quiz = await self.repository.get_one_or_404({"id":quiz_id})
         await self.action_repository.is_user_owner_or_admin(quiz.company_id, current_user.id)
         await self.repository.delete_res(quiz.id)
+        await answer_key_cache.invalidate(quiz.id)
 
-    async def get_quizzes_company(self, company_id:UUID, current_user:User):
+    async def get_quizzes_company(
+        self,
+        company_id: UUID,
+        current_user: User,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ):
         await self.action_repository.is_user_owner_or_admin(company_id, current_user.id)
-        return await self.repository.get_many_by_params(company_id=company_id)
+        return await self.repository.get_page(
+            cursor, limit, profile="quiz_with_questions", company_id=company_id
+        )
+
+    async def get_popular_quizzes(
+        self, company_id: UUID, current_user: User, limit: Optional[int] = None
+    ) -> list[dict]:
+        if not await self.action_repository.is_user_owner_or_admin(
+            company_id, current_user.id
+        ):
+            raise UserForbidden
+        limit = min(limit or config.POPULAR_QUIZZES_DEFAULT, config.POPULAR_QUIZZES_MAX)
+        ranking = await Redis.get_popular_quizzes(company_id, limit)
+        if ranking is None:
+            await Redis.seed_popular_quizzes(
+                company_id, await self.repository.get_frequencies(company_id)
+            )
+            ranking = await Redis.get_popular_quizzes(company_id, limit) or []
+        titles = await self.repository.get_titles([UUID(quiz_id) for quiz_id, _ in ranking])
+        return [
+            {"id": quiz_id, "title": titles[UUID(quiz_id)], "attempts": attempts}
+            for quiz_id, attempts in ranking
+            if UUID(quiz_id) in titles
+        ]
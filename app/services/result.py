@@ -1,16 +1,29 @@
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dtos.result import ResultSchema
+from app.entity.enums import ExportStatus
 from app.entity.models import User
 from app.repository.action import ActionRepository
 from app.repository.answer import AnswerRepository
 from app.repository.question import QuestionRepository
 from app.repository.quiz import QuizRepository
 from app.repository.result import ResultRepository
-from app.services.errors import UserForbidden
+from app.services.errors import ErrorNotFound, UserForbidden
+from app.utils.answer_key import answer_key_cache
+from app.utils.celery_worker import export_results
+from app.utils.export import (
+    check_export_format,
+    export_artifact_path,
+    ranged_file_response,
+    stream_export,
+)
 from app.utils.redis import Redis
+from app.utils.result_records import resolve_results
+from app.utils.result_writer import result_writer
 
 
 class ResultService:
@@ -37,52 +50,46 @@ class ResultService:
         user_id: UUID,
         answers_input: list[ResultSchema],
     ):
-        quiz = await self.quiz_repository.get_one_or_404({"id": quiz_id})
+        quiz = await self.quiz_repository.get_one_or_404(
+            {"id": quiz_id}, profile="quiz_with_company"
+        )
 
         await self.action_repository.is_user_member(quiz.company_id, user_id)
 
-        questions = await self.question_repository.get_many_by_params(quiz_id=quiz.id)
-
-        correct_answers = {}
-        for question in questions:
-            answers = await self.answer_repository.get_many_by_params(
-                question_id=question.id, is_correct=True
-            )
-            correct_answers[question.id] = [answer.id for answer in answers]
-
-        correct_answers_count = 0
-        detailed_answers = []
-        for user_answer in answers_input:
-            question_id = user_answer.question_id
-            user_answer_id = user_answer.answer_id
-
-            is_correct = set(user_answer_id) == set(
-                correct_answers.get(question_id, [])
-            )
-            if is_correct:
-                correct_answers_count += 1
-
-            question_name = await self.question_repository.get_one(id=question_id)
-            answer_name = await self.answer_repository.get_many_by_list(user_answer_id)
-            detailed_answers.append(
-                {
-                    "question": question_name.title,
-                    "answer": answer_name,
-                    "is_correct": is_correct,
-                }
+        answer_key = await answer_key_cache.get(quiz, self.quiz_repository)
+        correct_answers_count, detailed_answers = answer_key.grade(answers_input)
+        score_percentage = (correct_answers_count / answer_key.total_questions) * 100
+        if not await Redis.record_quiz_attempt(quiz_id, quiz.company_id):
+            # This attempt is already pending, so the seed counts it.
+            await Redis.seed_popular_quizzes(
+                quiz.company_id,
+                await self.quiz_repository.get_frequencies(quiz.company_id),
             )
-        score_percentage = (correct_answers_count / len(questions)) * 100
-        await self.quiz_repository.update(quiz_id, {"frequency": quiz.frequency + 1})
-        result = await self.repository.create(
+        # Hand the connection back before waiting on the writer, which needs
+        # one of its own from the same pool to flush the batch.
+        await self.db.commit()
+        result_id = uuid4()
+        result = await result_writer.write(
             {
+                "id": result_id,
                 "user_id": user_id,
                 "quiz_id": quiz_id,
                 "correct_answers": correct_answers_count,
-                "total_questions": len(questions),
+                "total_questions": answer_key.total_questions,
                 "score_percentage": score_percentage,
-            }
+            },
+            quiz.company_id,
+            [
+                {
+                    "result_id": result_id,
+                    "question_id": answer["question_id"],
+                    "answer_ids": answer["answer_ids"],
+                    "is_correct": answer["is_correct"],
+                }
+                for answer in detailed_answers
+            ],
         )
-        await Redis.save_results_to_redis(result, detailed_answers)
+        await Redis.save_results_to_redis(quiz, result, detailed_answers, answer_key)
         return result
 
     async def get_user_average_in_company(
@@ -91,21 +98,16 @@ class ResultService:
         if (
             user_id != current_user.id
         ) and not await self.action_repository.is_user_owner_or_admin(
-            current_user.id, company_id
+            company_id, current_user.id
         ):
             raise UserForbidden
 
-        results = await self.repository.get_results_by_user_and_company(
+        average_percentage = await self.repository.get_average_score(
             user_id, company_id
         )
-
-        if not results:
+        if average_percentage is None:
             return 0.0
 
-        total_score_percentage = sum(result.score_percentage for result in results)
-
-        average_percentage = total_score_percentage / len(results)
-
         return {"average_percentage": average_percentage}
 
     async def get_user_average_across_system(
@@ -113,52 +115,22 @@ class ResultService:
     ) -> float:
         if user_id != current_user.id:
             raise UserForbidden
-        results = await self.repository.get_results_by_user(user_id)
-        if not results:
+        average_percentage = await self.repository.get_average_score(user_id)
+        if average_percentage is None:
             return 0.0
 
-        total_score_percentage = sum(result.score_percentage for result in results)
-
-        average_percentage = total_score_percentage / len(results)
-
         return {"average_percentage_system": average_percentage}
 
-    async def get_analytics_user_by_all_quizzes(
-        self,
-        user_id: UUID,
-        current_user: User,
-    ):
-        if user_id != current_user.id:
-            raise UserForbidden
-
-        attempts = await self.repository.get_results_by_user(user_id)
-        total_score = 0
-        list_attempts = []
-
-        for quiz in attempts:
-            quiz_name = (await self.quiz_repository.get_one(id=quiz.quiz_id)).title
-
-            total_score += quiz.score_percentage
-
-            list_attempts.append(
-                {
-                    "quiz_name": quiz_name,
-                    "last_attempt": quiz.create_at,
-                    "score_percentage": quiz.score_percentage,
-                    "average_score": round(total_score / (len(list_attempts) + 1), 1),
-                }
-            )
-
-        return list_attempts
-
     async def download_user_results(
         self, user_id: UUID, current_user: User, file_format: str
     ):
         if user_id != current_user.id:
             raise UserForbidden
 
-        query = f"{user_id}:*:*"
-        return await Redis.export_redis_data(query, file_format)
+        return stream_export(
+            resolve_results(Redis.iter_results(Redis.user_results_key(user_id))),
+            file_format,
+        )
 
     async def download_member_results(
         self,
@@ -172,11 +144,51 @@ class ResultService:
             company_id, current_user.id
         ):
             raise UserForbidden
-        if user_id and not quiz_id:
-            if not await self.action_repository.is_user_member(user_id, company_id):
-                query = f"{user_id}:*:{company_id}"
-        elif quiz_id and not user_id:
-            query = f"*:{quiz_id}:{company_id}"
-        else:
-            query = f"*:*:{company_id}"
-        return await Redis.export_redis_data(query, file_format)
+        return stream_export(
+            resolve_results(Redis.iter_member_results(company_id, user_id, quiz_id)),
+            file_format,
+        )
+
+    async def create_export_job(
+        self,
+        company_id: UUID,
+        current_user: User,
+        file_format: str,
+        user_id: Optional[UUID] = None,
+        quiz_id: Optional[UUID] = None,
+    ):
+        if not await self.action_repository.is_user_owner_or_admin(
+            company_id, current_user.id
+        ):
+            raise UserForbidden
+        check_export_format(file_format)
+
+        job, created = await Redis.create_export_job(
+            company_id, file_format, user_id, quiz_id
+        )
+        if created:
+            await run_in_threadpool(export_results.delay, job["id"])
+        return job
+
+    async def get_export_job(self, job_id: UUID, current_user: User):
+        job = await Redis.get_export_job(job_id)
+        if job is None:
+            raise ErrorNotFound
+        if not await self.action_repository.is_user_owner_or_admin(
+            UUID(job["company_id"]), current_user.id
+        ):
+            raise UserForbidden
+        return job
+
+    async def download_export(
+        self, job_id: UUID, current_user: User, range_header: Optional[str] = None
+    ):
+        job = await self.get_export_job(job_id, current_user)
+        if job["status"] != ExportStatus.DONE:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="Export is not ready"
+            )
+        path = export_artifact_path(job["id"], job["file_format"])
+        if not path.exists():
+            raise ErrorNotFound
+        return ranged_file_response(path, range_header, path.name)
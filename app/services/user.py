@@ -2,11 +2,13 @@ from typing import Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dtos.action import ActionDetail
+from app.dtos.pagination import Page
 from app.dtos.user import UserDetail, UserSchema, UserUpdate
 from app.entity.models import User
 from app.repository.action import ActionRepository
 from app.repository.users import UserRepository
 from app.utils.hash_password import Hash
+from app.utils.token_cache import token_cache
 from app.services.errors import UserForbidden
 
 
@@ -22,9 +24,9 @@ class UserService:
         self.action_repository = action_repository
 
     async def get_all_users(
-        self, offset: Optional[int] = None, limit: Optional[int] = None
-    ) -> list[UserDetail]:
-        return await self.repository.get_many(offset, limit)
+        self, cursor: Optional[str] = None, limit: Optional[int] = None
+    ) -> Page[UserDetail]:
+        return await self.repository.get_page(cursor, limit)
 
     async def get_one_user(self, user_id: UUID) -> UserDetail:
         return await self.repository.get_one_or_404({"id": user_id})
@@ -44,26 +46,29 @@ class UserService:
 
         if body_dict.get("password"):
             body_dict["password"] = await Hash.get_password_hash(body_dict["password"])
-        return await self.repository.update(user_id, body_dict)
+        user = await self.repository.update(user_id, body_dict)
+        token_cache.invalidate_user(user_id)
+        return user
 
     async def delete_user(self, user_id: UUID, current_user: User) -> None:
         if user_id != current_user.id:
             raise UserForbidden
-        return await self.repository.delete_res(user_id)
+        user = await self.repository.delete_res(user_id)
+        token_cache.invalidate_user(user_id)
+        return user
 
     async def get_users_in_company(
         self,
         company_id: UUID,
         current_user: User,
-        offset: Optional[int],
-        limit: Optional[int],
-        admin: Optional[bool],
-    ) -> list[UserDetail]:
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        admin: Optional[bool] = False,
+    ) -> Page[UserDetail]:
         await self.action_repository.is_user_owner_or_admin(company_id, current_user.id)
-        users = await self.action_repository.get_users_by_company(
-            company_id, offset, limit, admin
+        return await self.action_repository.get_users_by_company(
+            company_id, cursor, limit, admin
         )
-        return users
 
     async def get_users_requests_to_companies(
         self, user_id: UUID
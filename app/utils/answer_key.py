@@ -0,0 +1,195 @@
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from app.core.settings import config
+from app.database.redis_connector import get_redis_client
+from logging_config import get_logger
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    quiz_id: UUID
+    version: str
+    correct: dict[UUID, frozenset[UUID]]
+    question_titles: dict[UUID, str]
+    answer_titles: dict[UUID, dict[UUID, str]]
+
+    @property
+    def total_questions(self) -> int:
+        return len(self.correct)
+
+    @cached_property
+    def question_order(self) -> list[UUID]:
+        return sorted(self.correct, key=str)
+
+    @cached_property
+    def answer_order(self) -> dict[UUID, list[UUID]]:
+        return {
+            question_id: sorted(titles, key=str)
+            for question_id, titles in self.answer_titles.items()
+        }
+
+    def grade(self, answers_input: list) -> tuple[int, list[dict]]:
+        correct_answers_count = 0
+        detailed_answers = []
+        for user_answer in answers_input:
+            question_id = user_answer.question_id
+            if question_id not in self.correct:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Question {question_id} does not belong to this quiz",
+                )
+            answer_titles = self.answer_titles[question_id]
+            answer_ids = frozenset(user_answer.answer_id)
+            if not answer_ids <= answer_titles.keys():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown answer for question {question_id}",
+                )
+
+            is_correct = answer_ids == self.correct[question_id]
+            if is_correct:
+                correct_answers_count += 1
+            detailed_answers.append(
+                {
+                    "question_id": question_id,
+                    "answer_ids": list(user_answer.answer_id),
+                    "question": self.question_titles[question_id],
+                    "answer": [answer_titles[answer_id] for answer_id in user_answer.answer_id],
+                    "is_correct": is_correct,
+                }
+            )
+        return correct_answers_count, detailed_answers
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "quiz_id": str(self.quiz_id),
+                "version": self.version,
+                "questions": {
+                    str(question_id): {
+                        "title": self.question_titles[question_id],
+                        "correct": [str(answer_id) for answer_id in correct],
+                        "answers": {
+                            str(answer_id): title
+                            for answer_id, title in self.answer_titles[question_id].items()
+                        },
+                    }
+                    for question_id, correct in self.correct.items()
+                },
+            }
+        )
+
+    @classmethod
+    def from_json(cls, value: str) -> "AnswerKey":
+        data = json.loads(value)
+        questions = {UUID(question_id): question for question_id, question in data["questions"].items()}
+        return cls(
+            quiz_id=UUID(data["quiz_id"]),
+            version=data["version"],
+            correct={
+                question_id: frozenset(UUID(answer_id) for answer_id in question["correct"])
+                for question_id, question in questions.items()
+            },
+            question_titles={
+                question_id: question["title"] for question_id, question in questions.items()
+            },
+            answer_titles={
+                question_id: {
+                    UUID(answer_id): title for answer_id, title in question["answers"].items()
+                }
+                for question_id, question in questions.items()
+            },
+        )
+
+
+class AnswerKeyCache:
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[UUID, AnswerKey] = OrderedDict()
+
+    @staticmethod
+    def redis_key(quiz_id: UUID) -> str:
+        return f"answer_key:{quiz_id}"
+
+    async def get(self, quiz, repository) -> AnswerKey:
+        version = quiz.update_at.isoformat()
+        answer_key = self._entries.get(quiz.id)
+        if answer_key is not None and answer_key.version == version:
+            self._entries.move_to_end(quiz.id)
+            self.hits += 1
+            return answer_key
+
+        answer_key = await self._load_from_redis(quiz.id, version)
+        if answer_key is not None:
+            self.redis_hits += 1
+        else:
+            self.misses += 1
+            answer_key = await repository.get_answer_key(quiz.id, version)
+            await self._save_to_redis(answer_key)
+        self._store(answer_key)
+        return answer_key
+
+    async def invalidate(self, quiz_id: UUID) -> None:
+        self._entries.pop(quiz_id, None)
+        try:
+            redis = await get_redis_client()
+            await redis.delete(self.redis_key(quiz_id))
+        except (RedisError, OSError) as e:
+            get_logger(__name__).warning(f"Can't invalidate answer key {quiz_id}: {e}")
+
+    def _store(self, answer_key: AnswerKey) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[answer_key.quiz_id] = answer_key
+        self._entries.move_to_end(answer_key.quiz_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def _load_from_redis(self, quiz_id: UUID, version: str) -> Optional[AnswerKey]:
+        try:
+            redis = await get_redis_client()
+            value = await redis.get(self.redis_key(quiz_id))
+        except (RedisError, OSError) as e:
+            get_logger(__name__).warning(f"Can't read answer key {quiz_id}: {e}")
+            return None
+        if not value:
+            return None
+        answer_key = AnswerKey.from_json(value)
+        return answer_key if answer_key.version == version else None
+
+    async def _save_to_redis(self, answer_key: AnswerKey) -> None:
+        try:
+            redis = await get_redis_client()
+            await redis.set(
+                self.redis_key(answer_key.quiz_id), answer_key.to_json(), ex=self.ttl
+            )
+        except (RedisError, OSError) as e:
+            get_logger(__name__).warning(
+                f"Can't save answer key {answer_key.quiz_id}: {e}"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+        }
+
+
+answer_key_cache = AnswerKeyCache(
+    maxsize=config.ANSWER_KEY_CACHE_SIZE, ttl=config.ANSWER_KEY_TTL
+)
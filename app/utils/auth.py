@@ -2,9 +2,9 @@ from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import HTTPException, status
 from jose import jwt, JWTError, ExpiredSignatureError
-from jwt import PyJWKClient
 from fastapi.security import HTTPBearer, OAuth2PasswordBearer
 from app.core.settings import config
+from app.utils.jwks import jwks_store
 
 security = HTTPBearer()
 
@@ -28,7 +28,9 @@ class Auth:
         return encoded_access_token
 
     @staticmethod
-    async def get_current_user_with_token(token: str) -> Optional[tuple[str, str]]:
+    async def get_current_user_with_token(
+        token: str,
+    ) -> Optional[tuple[str, str, Optional[int]]]:
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -44,7 +46,7 @@ class Auth:
             email = payload.get("sub")
             if email is None:
                 raise credentials_exception
-            return email, "own_service"
+            return email, "own_service", payload.get("exp")
 
         except ExpiredSignatureError:
             raise HTTPException(
@@ -54,12 +56,14 @@ class Auth:
             )
         except JWTError:
             try:
-                jwks_client = PyJWKClient(config.AUTH0_JWKS_URL)
-                signing_key = jwks_client.get_signing_key_from_jwt(token)
+                kid = jwt.get_unverified_header(token).get("kid")
+                signing_key = await jwks_store.get_signing_key(kid)
+                if signing_key is None:
+                    raise credentials_exception
 
                 payload = jwt.decode(
                     token,
-                    signing_key.key,
+                    signing_key,
                     algorithms=[config.ALGORITHM],
                     issuer=config.ISSUER,
                     audience=config.API_AUDIENCE,
@@ -67,6 +71,6 @@ class Auth:
                 email = payload.get("email")
                 if email is None:
                     raise credentials_exception
-                return email, "auth0"
+                return email, "auth0", payload.get("exp")
             except JWTError as e:
                 raise credentials_exception from e
@@ -1,11 +1,25 @@
 import asyncio
+import time
 from datetime import timedelta, datetime
-from sqlalchemy import func, select
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import Text, bindparam, cast, false, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from app.database.db import sessionmanager
-from app.entity.models import User, Result, Quiz, Notification
+from app.entity.enums import ActionStatus, ExportStatus
+from app.entity.models import Action, Company, User, Result, Quiz, Notification
+from app.repository.analytics import AnalyticsRepository
 from celery.schedules import crontab
 from celery import Celery
 from app.core.settings import config
+from app.utils.export import (
+    export_artifact_path,
+    remove_expired_artifacts,
+    write_export_artifact,
+)
+from app.utils.redis import Redis
+from app.utils.result_records import resolve_results
+from logging_config import get_logger
 
 celery_app = Celery(
     main="tasks",
@@ -19,11 +33,196 @@ celery_app.conf.update(
         "run-every-day-at-midnight": {
             "task": "app.utils.celery_worker.run_user_quiz_check",
             "schedule": crontab(minute=0, hour=0),
-        }
+        },
+        "flush-quiz-attempts": {
+            "task": "app.utils.celery_worker.flush_quiz_attempts",
+            "schedule": config.QUIZ_ATTEMPTS_FLUSH_INTERVAL,
+        },
+        "refresh-result-rollups": {
+            "task": "app.utils.celery_worker.refresh_result_rollups",
+            "schedule": config.ANALYTICS_ROLLUP_INTERVAL,
+        },
+        "remove-expired-exports": {
+            "task": "app.utils.celery_worker.remove_expired_exports",
+            "schedule": config.EXPORT_CLEANUP_INTERVAL,
+        },
     },
 )
 
 
+@celery_app.task(bind=True, max_retries=5)
+def fan_out_quiz_notifications(self, quiz_id: str, after_user_id: Optional[str] = None):
+    loop = asyncio.get_event_loop()
+    progress = loop.run_until_complete(
+        fan_out_quiz_notifications_async(UUID(quiz_id), after_user_id)
+    )
+    if not progress["done"]:
+        raise self.retry(
+            kwargs={"quiz_id": quiz_id, "after_user_id": progress["after_user_id"]},
+            countdown=config.NOTIFICATION_FANOUT_RETRY_DELAY,
+        )
+
+
+async def fan_out_quiz_notifications_async(
+    quiz_id: UUID, after_user_id: Optional[str] = None
+) -> dict:
+    progress = {"after_user_id": after_user_id, "done": False}
+    async with sessionmanager.session() as session:
+        quiz = await session.execute(
+            select(Quiz.title, Quiz.company_id, Company.name)
+            .join(Company, Company.id == Quiz.company_id)
+            .where(Quiz.id == quiz_id)
+        )
+        quiz = quiz.one_or_none()
+        if quiz is None:
+            progress["done"] = True
+            return progress
+
+        text = f"Новий квіз {quiz.title} від компанії {quiz.name}"
+        while True:
+            members = select(Action.user_id).where(
+                Action.company_id == quiz.company_id,
+                Action.status == ActionStatus.MEMBER,
+            )
+            if progress["after_user_id"]:
+                members = members.where(Action.user_id > UUID(progress["after_user_id"]))
+            members = (
+                members.order_by(Action.user_id)
+                .limit(config.NOTIFICATION_FANOUT_CHUNK)
+                .subquery()
+            )
+            # PostgreSQL 12 has no built-in gen_random_uuid() without pgcrypto.
+            notification_id = cast(
+                func.md5(
+                    cast(members.c.user_id, Text)
+                    + cast(func.random(), Text)
+                    + cast(func.clock_timestamp(), Text)
+                ),
+                PGUUID(as_uuid=True),
+            )
+            stmt = (
+                insert(Notification)
+                .from_select(
+                    ["id", "user_id", "text", "status"],
+                    select(
+                        notification_id,
+                        members.c.user_id,
+                        literal(text, Text),
+                        false(),
+                    ),
+                )
+                .returning(Notification.user_id)
+            )
+            user_ids = (await session.execute(stmt)).scalars().all()
+            await session.commit()
+
+            if user_ids:
+                progress["after_user_id"] = str(max(user_ids))
+            if len(user_ids) < config.NOTIFICATION_FANOUT_CHUNK:
+                progress["done"] = True
+                return progress
+    # The session swallows DB errors; resume after the last committed chunk.
+    return progress
+
+
+@celery_app.task(ignore_result=True)
+def flush_quiz_attempts():
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(flush_quiz_attempts_async())
+
+
+async def flush_quiz_attempts_async():
+    pending = await Redis.get_pending_quiz_attempts()
+    if not pending:
+        return
+
+    quizzes = Quiz.__table__
+    stmt = (
+        update(quizzes)
+        .where(quizzes.c.id == bindparam("quiz_id"))
+        .values(
+            frequency=func.coalesce(quizzes.c.frequency, 0) + bindparam("delta"),
+            # Counting attempts is not an edit: keep update_at, which versions
+            # the cached answer key and the result title snapshots.
+            update_at=quizzes.c.update_at,
+        )
+    )
+    flushed = False
+    async with sessionmanager.session() as session:
+        await session.execute(
+            stmt,
+            [
+                {"quiz_id": UUID(quiz_id), "delta": count}
+                for quiz_id, count in pending.items()
+            ],
+        )
+        await session.commit()
+        flushed = True
+    # Only acknowledge what reached the database; new attempts keep accumulating.
+    if flushed:
+        await Redis.ack_pending_quiz_attempts(pending)
+
+
+@celery_app.task(ignore_result=True)
+def refresh_result_rollups():
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(refresh_result_rollups_async())
+
+
+async def refresh_result_rollups_async():
+    async with sessionmanager.session() as session:
+        await AnalyticsRepository(session).refresh_daily_rollups(
+            timedelta(seconds=config.ANALYTICS_ROLLUP_LAG)
+        )
+
+
+@celery_app.task(ignore_result=True)
+def export_results(job_id: str):
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(export_results_async(job_id))
+
+
+async def export_results_async(job_id: str):
+    job = await Redis.get_export_job(job_id)
+    if job is None or job["status"] == ExportStatus.FAILED.value:
+        return
+
+    filters = (job["company_id"], job.get("user_id"), job.get("quiz_id"))
+    total = await Redis.count_member_results(*filters)
+    await Redis.update_export_job(
+        job_id, status=ExportStatus.RUNNING.value, total=total, heartbeat_at=time.time()
+    )
+    processed = 0
+
+    async def chunks():
+        nonlocal processed
+        async for chunk in Redis.iter_member_results(*filters):
+            yield chunk
+            processed += len(chunk)
+            await Redis.update_export_job(
+                job_id, processed=processed, heartbeat_at=time.time()
+            )
+
+    try:
+        await write_export_artifact(
+            resolve_results(chunks()),
+            job["file_format"],
+            export_artifact_path(job_id, job["file_format"]),
+        )
+    except Exception as e:
+        get_logger(__name__).error(f"Export {job_id} failed: {e}")
+        await Redis.update_export_job(job_id, status=ExportStatus.FAILED.value, error=e)
+        return
+    await Redis.update_export_job(
+        job_id, status=ExportStatus.DONE.value, processed=processed
+    )
+
+
+@celery_app.task(ignore_result=True)
+def remove_expired_exports():
+    remove_expired_artifacts(config.EXPORT_RETENTION)
+
+
 @celery_app.task(autoretry_for=(Exception,), retry_backoff=True)
 def run_user_quiz_check():
     loop = asyncio.get_event_loop()
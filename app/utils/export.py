@@ -0,0 +1,175 @@
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import anyio
+from fastapi import HTTPException, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from app.core.settings import config
+
+RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)")
+READ_CHUNK_SIZE = 64 * 1024
+
+CSV_FIELDS = ["user_id", "company_name", "quiz_name", "question", "answer", "is_true"]
+
+
+def csv_rows(item: dict) -> list[list]:
+    return [
+        [
+            item["user_id"],
+            item["company_name"],
+            item["quiz_name"],
+            answer["question"],
+            ", ".join(answer["answer"]),
+            answer["is_correct"],
+        ]
+        for answer in item["answers"]
+    ]
+
+
+async def iter_csv(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_FIELDS)
+    yield buffer.getvalue()
+    async for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        for item in chunk:
+            writer.writerows(csv_rows(item))
+        yield buffer.getvalue()
+
+
+async def iter_ndjson(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[str]:
+    async for chunk in chunks:
+        yield "".join(json.dumps(item) + "\n" for item in chunk)
+
+
+async def iter_json(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[str]:
+    yield "["
+    separator = ""
+    async for chunk in chunks:
+        for item in chunk:
+            yield separator + json.dumps(item)
+            separator = ","
+    yield "]"
+
+
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv"),
+    "json": (iter_json, "application/json"),
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+}
+
+
+def check_export_format(file_format: str) -> None:
+    if file_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format, use one of: {', '.join(EXPORT_FORMATS)}",
+        )
+
+
+def stream_export(
+    chunks: AsyncIterator[list[dict]], file_format: str
+) -> StreamingResponse:
+    check_export_format(file_format)
+    serialize, media_type = EXPORT_FORMATS[file_format]
+    return StreamingResponse(
+        serialize(chunks),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="quiz_results.{file_format}"'
+        },
+    )
+
+
+def export_artifact_path(job_id: str, file_format: str) -> Path:
+    return Path(config.EXPORT_DIR) / f"{job_id}.{file_format}.gz"
+
+
+async def write_export_artifact(
+    chunks: AsyncIterator[list[dict]], file_format: str, path: Path
+) -> None:
+    serialize, _ = EXPORT_FORMATS[file_format]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part = path.with_name(path.name + ".part")
+    try:
+        with gzip.open(part, "wt", encoding="utf-8", newline="") as file:
+            async for data in serialize(chunks):
+                file.write(data)
+        os.replace(part, path)
+    finally:
+        part.unlink(missing_ok=True)
+
+
+def remove_expired_artifacts(max_age: int) -> int:
+    directory = Path(config.EXPORT_DIR)
+    if not directory.is_dir():
+        return 0
+    removed = 0
+    expired_before = time.time() - max_age
+    for path in directory.iterdir():
+        if path.is_file() and path.stat().st_mtime < expired_before:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    match = RANGE_PATTERN.fullmatch((range_header or "").strip())
+    if match is None or match.groups() == ("", ""):
+        return None
+    start, end = match.groups()
+    if not start:
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+async def iter_file_range(path: Path, start: int, end: int) -> AsyncIterator[bytes]:
+    async with await anyio.open_file(path, "rb") as file:
+        await file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = await file.read(min(READ_CHUNK_SIZE, remaining))
+            if not data:
+                return
+            remaining -= len(data)
+            yield data
+
+
+def ranged_file_response(
+    path: Path, range_header: Optional[str], filename: str
+) -> Response:
+    size = path.stat().st_size
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+    byte_range = parse_range(range_header, size)
+    if byte_range is None:
+        return FileResponse(path, media_type="application/gzip", headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file_range(path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type="application/gzip",
+        headers=headers,
+    )
@@ -1,12 +1,55 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 
+from app.core.settings import config
+
+
 class Hash:
+    # Stored for externally managed (Auth0) accounts; never matches any password.
+    UNUSABLE_PASSWORD = "!"
+
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    executor = ThreadPoolExecutor(
+        max_workers=config.HASH_MAX_WORKERS, thread_name_prefix="bcrypt"
+    )
+    in_flight = 0
+    max_queue_depth = 0
+    completed = 0
+
+    @staticmethod
+    async def run_in_executor(func, *args):
+        Hash.in_flight += 1
+        Hash.max_queue_depth = max(Hash.max_queue_depth, Hash.queue_depth())
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(Hash.executor, func, *args)
+        finally:
+            Hash.in_flight -= 1
+            Hash.completed += 1
+
+    @staticmethod
+    def queue_depth() -> int:
+        return max(Hash.in_flight - config.HASH_MAX_WORKERS, 0)
+
+    @staticmethod
+    def stats() -> dict:
+        return {
+            "max_workers": config.HASH_MAX_WORKERS,
+            "in_flight": Hash.in_flight,
+            "queue_depth": Hash.queue_depth(),
+            "max_queue_depth": Hash.max_queue_depth,
+            "completed": Hash.completed,
+        }
 
     @staticmethod
     async def get_password_hash(password: str) -> str:
-        return Hash.pwd_context.hash(password)
+        return await Hash.run_in_executor(Hash.pwd_context.hash, password)
 
     @staticmethod
     async def verify_password(plain_password, hashed_password):
-        return Hash.pwd_context.verify(plain_password, hashed_password)
+        if hashed_password == Hash.UNUSABLE_PASSWORD:
+            return False
+        return await Hash.run_in_executor(
+            Hash.pwd_context.verify, plain_password, hashed_password
+        )
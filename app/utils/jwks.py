@@ -0,0 +1,84 @@
+import asyncio
+import time
+from typing import Any, Optional
+
+import httpx
+from jwt import PyJWKSet
+from jwt.exceptions import PyJWKSetError
+
+from app.core.settings import config
+from logging_config import get_logger
+
+
+class JWKSKeyStore:
+    def __init__(
+        self, url: str, ttl: int, min_refetch_interval: int, timeout: float
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.min_refetch_interval = min_refetch_interval
+        self.timeout = timeout
+        self._keys: dict[str, Any] = {}
+        self._fetched_at: float = 0.0
+        self._attempted_at: float = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() - self._fetched_at > self.ttl
+
+    async def fetch(self) -> None:
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+        jwk_set = PyJWKSet.from_dict(response.json())
+        self._keys = {jwk.key_id: jwk.key for jwk in jwk_set.keys if jwk.key_id}
+        self._fetched_at = time.monotonic()
+
+    async def refetch(self) -> None:
+        attempted_at = self._attempted_at
+        async with self._lock:
+            if self._attempted_at != attempted_at:
+                # Another caller refetched while we were waiting for the lock.
+                return
+            self._attempted_at = time.monotonic()
+            try:
+                await self.fetch()
+            except (httpx.HTTPError, PyJWKSetError, ValueError) as e:
+                get_logger(__name__).warning(f"Can't fetch JWKS from {self.url}: {e}")
+
+    async def get_signing_key(self, kid: Optional[str]) -> Optional[Any]:
+        key = self._keys.get(kid)
+        if key is not None and not self.is_stale:
+            return key
+        if self._lock.locked():
+            # A refetch is already in flight; wait for it instead of giving up.
+            async with self._lock:
+                pass
+        elif time.monotonic() - self._attempted_at >= self.min_refetch_interval:
+            await self.refetch()
+        return self._keys.get(kid)
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl / 2)
+            await self.refetch()
+
+    async def start(self) -> None:
+        await self.refetch()
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+
+jwks_store = JWKSKeyStore(
+    config.AUTH0_JWKS_URL,
+    ttl=config.AUTH0_JWKS_TTL,
+    min_refetch_interval=config.AUTH0_JWKS_MIN_REFETCH_INTERVAL,
+    timeout=config.AUTH0_JWKS_TIMEOUT,
+)
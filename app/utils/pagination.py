@@ -0,0 +1,30 @@
+import base64
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from app.core.settings import config
+
+
+def page_size(limit: Optional[int] = None) -> int:
+    if not limit or limit < 1:
+        return config.PAGE_SIZE_DEFAULT
+    return min(limit, config.PAGE_SIZE_MAX)
+
+
+def encode_cursor(create_at: datetime, id: UUID) -> str:
+    raw = f"{create_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        create_at, id = raw.split("|")
+        return datetime.fromisoformat(create_at), UUID(id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
@@ -1,112 +1,333 @@
-import json
+import time
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from uuid import uuid4
 from fastapi import HTTPException
-from fastapi.responses import FileResponse
-import json
-import csv
-import tempfile
-from app.entity.models import Result
+from app.entity.enums import ExportStatus
+from app.entity.models import Quiz, Result
+from app.core.settings import config
 from app.database.redis_connector import get_redis_client
+from app.utils.answer_key import AnswerKey
+from app.utils.result_records import (
+    decode_result,
+    encode_result,
+    encode_titles,
+    titles_key,
+)
+
+QUIZ_ATTEMPTS_PENDING_KEY = "quiz_attempts:pending"
+RESULTS_TTL = 48 * 3600
+
+# Subtract a flushed count and drop the field once nothing is pending, atomically.
+DECREMENT_PENDING_SCRIPT = """
+local left = redis.call('HINCRBY', KEYS[1], ARGV[1], -tonumber(ARGV[2]))
+if left <= 0 then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return left
+"""
+
+# Rankings only count attempts once they are seeded from quizzes.frequency.
+RECORD_ATTEMPT_SCRIPT = """
+redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    redis.call('ZINCRBY', KEYS[2], 1, ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# Flushed counts plus attempts still pending, set once per company.
+SEED_POPULARITY_SCRIPT = """
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    return 0
+end
+for i = 1, #ARGV, 2 do
+    local pending = tonumber(redis.call('HGET', KEYS[1], ARGV[i]) or '0')
+    redis.call('ZADD', KEYS[2], tonumber(ARGV[i + 1]) + pending, ARGV[i])
+end
+redis.call('SET', KEYS[3], 1)
+return 1
+"""
 
 
 class Redis:
     @staticmethod
-    async def save_data_to_redis_db(key, value):
-        redis = await get_redis_client()
-        await redis.set(key, value)
-        await redis.expire(key, 48 * 3600)
-        await redis.close()
+    def popularity_key(company_id) -> str:
+        return f"quiz_popularity:{company_id}"
 
+    @staticmethod
+    def popularity_seeded_key(company_id) -> str:
+        return f"quiz_popularity_seeded:{company_id}"
 
     @staticmethod
-    async def get_data_by_pattern(pattern: str):
+    async def record_quiz_attempt(quiz_id, company_id) -> bool:
         redis = await get_redis_client()
-        data = []
-        keys = await redis.keys(pattern)
-        for key in keys:
-            value = await redis.get(key)
-            if value:
-                data.append(json.loads(value))
-        await redis.close()
-        return data
+        record = redis.register_script(RECORD_ATTEMPT_SCRIPT)
+        seeded = await record(
+            keys=[
+                QUIZ_ATTEMPTS_PENDING_KEY,
+                Redis.popularity_key(company_id),
+                Redis.popularity_seeded_key(company_id),
+            ],
+            args=[str(quiz_id)],
+        )
+        return bool(seeded)
 
     @staticmethod
-    async def save_results_to_redis(quiz_results: Result, answers_input: list[dict]):
-        try:
-            detailed_answers = []
-            for answer in answers_input:
-                detailed_answers.append(
-                    {
-                        "question": str(answer["question"]),
-                        "answer": [aid.title for aid in answer["answer"]],
-                        "is_correct": answer["is_correct"],
-                    }
+    async def get_pending_quiz_attempts() -> dict[str, int]:
+        redis = await get_redis_client()
+        pending = await redis.hgetall(QUIZ_ATTEMPTS_PENDING_KEY)
+        return {quiz_id: int(count) for quiz_id, count in pending.items()}
+
+    @staticmethod
+    async def ack_pending_quiz_attempts(flushed: dict[str, int]):
+        redis = await get_redis_client()
+        decrement = redis.register_script(DECREMENT_PENDING_SCRIPT)
+        async with redis.pipeline(transaction=False) as pipe:
+            for quiz_id, count in flushed.items():
+                await decrement(
+                    keys=[QUIZ_ATTEMPTS_PENDING_KEY], args=[quiz_id, count], client=pipe
                 )
+            await pipe.execute()
 
-            quiz_result_data = {
-                "user_id": str(quiz_results.user_id),
-                "quiz_name": quiz_results.quiz.title,
-                "company_name": str(quiz_results.quiz.company.name),
-                "answers": detailed_answers,
-            }
+    @staticmethod
+    async def get_popular_quizzes(company_id, limit: int) -> list[tuple[str, int]] | None:
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.exists(Redis.popularity_seeded_key(company_id))
+            pipe.zrevrange(Redis.popularity_key(company_id), 0, limit - 1, withscores=True)
+            seeded, ranking = await pipe.execute()
+        if not seeded:
+            return None
+        return [(quiz_id, int(score)) for quiz_id, score in ranking]
 
-            key = f"{quiz_results.user_id}:{quiz_results.quiz_id}:{quiz_results.quiz.company_id}"
-            await Redis.save_data_to_redis_db(
-                key,
-                json.dumps(quiz_result_data),
+    @staticmethod
+    async def seed_popular_quizzes(company_id, frequencies: dict):
+        redis = await get_redis_client()
+        seed = redis.register_script(SEED_POPULARITY_SCRIPT)
+        await seed(
+            keys=[
+                QUIZ_ATTEMPTS_PENDING_KEY,
+                Redis.popularity_key(company_id),
+                Redis.popularity_seeded_key(company_id),
+            ],
+            args=[
+                value
+                for quiz_id, frequency in frequencies.items()
+                for value in (str(quiz_id), frequency or 0)
+            ],
+        )
+
+    @staticmethod
+    def result_key(user_id, quiz_id, company_id) -> str:
+        return f"{user_id}:{quiz_id}:{company_id}"
+
+    @staticmethod
+    def user_results_key(user_id) -> str:
+        return f"results:user:{user_id}"
+
+    @staticmethod
+    def quiz_results_key(quiz_id) -> str:
+        return f"results:quiz:{quiz_id}"
+
+    @staticmethod
+    def company_results_key(company_id) -> str:
+        return f"results:company:{company_id}"
+
+    @staticmethod
+    async def save_data_to_redis_db(
+        key, value, index_keys: list[str], shared: Optional[tuple[str, str]] = None
+    ):
+        redis = await get_redis_client()
+        now = time.time()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, value, ex=RESULTS_TTL)
+            if shared is not None:
+                # Written once, then kept alive as long as any record refers to it.
+                pipe.set(*shared, ex=RESULTS_TTL, nx=True)
+                pipe.expire(shared[0], RESULTS_TTL)
+            for index_key in index_keys:
+                pipe.zadd(index_key, {key: now})
+                # Drop members whose result keys have already expired.
+                pipe.zremrangebyscore(index_key, "-inf", now - RESULTS_TTL)
+                pipe.expire(index_key, RESULTS_TTL)
+            await pipe.execute()
+
+    @staticmethod
+    async def iter_results(
+        index_key: str, company_id=None
+    ) -> AsyncIterator[list[dict]]:
+        redis = await get_redis_client()
+        # Page by score rather than rank: saves trim the head and move resubmitted
+        # keys to the tail while a long export runs. Results saved after the export
+        # started are left out.
+        until = time.time()
+        last_score, last_key, ties = float("-inf"), None, 0
+        while True:
+            limit = config.RESULTS_EXPORT_CHUNK + ties
+            entries = await redis.zrangebyscore(
+                index_key, last_score, until, start=0, num=limit, withscores=True
             )
-        except Exception as e:
-            raise HTTPException(
-                status_code=409, detail=f"Can't save data to redis: {str(e)}"
+            fetched = len(entries)
+            # Members sharing the last score are ordered by name; skip those already read.
+            entries = [
+                (key, score)
+                for key, score in entries
+                if score > last_score or last_key is None or key > last_key
+            ]
+            if not entries:
+                return
+            score = entries[-1][1]
+            ties = sum(1 for _, s in entries if s == score) + (
+                ties if score == last_score else 0
             )
+            last_key, last_score = entries[-1][0], score
+
+            keys = [key for key, _ in entries]
+            if company_id is not None:
+                keys = [key for key in keys if key.endswith(f":{company_id}")]
+            if keys:
+                values = await redis.mget(keys)
+                yield [
+                    decode_result(key, value)
+                    for key, value in zip(keys, values)
+                    if value
+                ]
+            if fetched < limit:
+                return
 
     @staticmethod
-    async def export_redis_data(query: str, file_format: str):
-        data = await Redis.get_data_by_pattern(query)
-        if file_format == "json":
-            temp_json_file = tempfile.NamedTemporaryFile(
-                delete=False, mode="w", suffix=".json"
-            )
-            json.dump(data, temp_json_file, indent=2)
-            temp_json_file.close()
+    async def iter_result(key: str) -> AsyncIterator[list[dict]]:
+        redis = await get_redis_client()
+        value = await redis.get(key)
+        if value:
+            yield [decode_result(key, value)]
+
+    @staticmethod
+    def member_results_index(company_id, user_id=None, quiz_id=None) -> tuple[str, Optional[str]]:
+        if user_id:
+            return Redis.user_results_key(user_id), company_id
+        if quiz_id:
+            return Redis.quiz_results_key(quiz_id), company_id
+        return Redis.company_results_key(company_id), None
+
+    @staticmethod
+    def iter_member_results(
+        company_id, user_id=None, quiz_id=None
+    ) -> AsyncIterator[list[dict]]:
+        if user_id and quiz_id:
+            return Redis.iter_result(Redis.result_key(user_id, quiz_id, company_id))
+        return Redis.iter_results(
+            *Redis.member_results_index(company_id, user_id, quiz_id)
+        )
+
+    @staticmethod
+    async def count_member_results(company_id, user_id=None, quiz_id=None) -> int:
+        redis = await get_redis_client()
+        if user_id and quiz_id:
+            return await redis.exists(Redis.result_key(user_id, quiz_id, company_id))
+        index_key, _ = Redis.member_results_index(company_id, user_id, quiz_id)
+        return await redis.zcard(index_key)
+
+    @staticmethod
+    def export_job_key(job_id) -> str:
+        return f"export_job:{job_id}"
+
+    @staticmethod
+    def export_request_key(company_id, file_format, user_id=None, quiz_id=None) -> str:
+        return f"export_request:{company_id}:{user_id or '*'}:{quiz_id or '*'}:{file_format}"
 
-            return FileResponse(
-                path=temp_json_file.name,
-                filename="quiz_results.json",
-                media_type="multipart/form-data",
+    @staticmethod
+    async def get_export_job(job_id) -> Optional[dict]:
+        redis = await get_redis_client()
+        job = await redis.hgetall(Redis.export_job_key(job_id))
+        if not job:
+            return None
+        if (
+            job["status"] in (ExportStatus.PENDING.value, ExportStatus.RUNNING.value)
+            and time.time() - float(job.get("heartbeat_at", 0)) > config.EXPORT_STALE_AFTER
+        ):
+            # The worker died or never picked the job up.
+            job.update(
+                status=ExportStatus.FAILED.value, error="Export worker stopped responding"
             )
+            await Redis.update_export_job(
+                job_id, status=job["status"], error=job["error"]
+            )
+        return job
 
-        elif file_format == "csv":
-            with tempfile.NamedTemporaryFile(
-                delete=False, mode="w", suffix=".csv"
-            ) as temp_csv_file:
-                fieldnames = [
-                    "user_id",
-                    "company_name",
-                    "quiz_name",
-                    "question",
-                    "answer",
-                    "is_true",
-                ]
-                writer = csv.DictWriter(temp_csv_file, fieldnames=fieldnames)
-                writer.writeheader()
-                for item in data:
-                    user_id = item["user_id"]
-                    company_name = item["company_name"]
-                    quiz_name = item["quiz_name"]
-                    answers = item["answers"]
-                    for question_data in answers:
-                        writer.writerow(
-                            {
-                                "user_id": user_id,
-                                "company_name": company_name,
-                                "quiz_name": quiz_name,
-                                "question": question_data["question"],
-                                "answer": ", ".join(question_data["answer"]),
-                                "is_true": question_data["is_correct"],
-                            }
-                        )
-            return FileResponse(
-                temp_csv_file.name,
-                filename="quiz_results.csv",
-                media_type="multipart/form-data",
+    @staticmethod
+    async def update_export_job(job_id, **fields):
+        redis = await get_redis_client()
+        await redis.hset(
+            Redis.export_job_key(job_id),
+            mapping={name: str(value) for name, value in fields.items()},
+        )
+
+    @staticmethod
+    async def create_export_job(
+        company_id, file_format: str, user_id=None, quiz_id=None
+    ) -> tuple[dict, bool]:
+        redis = await get_redis_client()
+        job = {
+            "id": str(uuid4()),
+            "status": ExportStatus.PENDING.value,
+            "company_id": str(company_id),
+            "file_format": file_format,
+            "processed": "0",
+            "total": "0",
+            "created_at": datetime.utcnow().isoformat(),
+            "heartbeat_at": str(time.time()),
+        }
+        if user_id:
+            job["user_id"] = str(user_id)
+        if quiz_id:
+            job["quiz_id"] = str(quiz_id)
+        job_key = Redis.export_job_key(job["id"])
+        request_key = Redis.export_request_key(company_id, file_format, user_id, quiz_id)
+
+        # The job hash exists before it is published, so a reader never sees a dangling id.
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(job_key, mapping=job)
+            pipe.expire(job_key, config.EXPORT_RETENTION)
+            await pipe.execute()
+        if await redis.set(request_key, job["id"], nx=True, ex=config.EXPORT_FRESHNESS):
+            return job, True
+
+        existing_id = await redis.get(request_key)
+        existing = await Redis.get_export_job(existing_id) if existing_id else None
+        if existing and existing["status"] != ExportStatus.FAILED.value:
+            await redis.delete(job_key)
+            return existing, False
+        await redis.set(request_key, job["id"], ex=config.EXPORT_FRESHNESS)
+        return job, True
+
+    @staticmethod
+    async def save_results_to_redis(
+        quiz: Quiz,
+        quiz_results: Result,
+        answers_input: list[dict],
+        answer_key: AnswerKey,
+    ):
+        try:
+            key = Redis.result_key(
+                quiz_results.user_id, quiz_results.quiz_id, quiz.company_id
+            )
+            await Redis.save_data_to_redis_db(
+                key,
+                encode_result(answer_key, answers_input),
+                [
+                    Redis.user_results_key(quiz_results.user_id),
+                    Redis.quiz_results_key(quiz_results.quiz_id),
+                    Redis.company_results_key(quiz.company_id),
+                ],
+                shared=(
+                    titles_key(quiz.id, answer_key.version),
+                    encode_titles(answer_key, quiz.title, quiz.company.name),
+                ),
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=409, detail=f"Can't save data to redis: {str(e)}"
             )
@@ -0,0 +1,145 @@
+import base64
+import json
+import zlib
+from typing import AsyncIterator, Optional
+
+from app.core.settings import config
+from app.database.redis_connector import get_redis_client
+from app.utils.answer_key import AnswerKey
+from logging_config import get_logger
+
+COMPACT_PREFIX = "2:"
+COMPRESSED_PREFIX = "3:"
+
+
+def titles_key(quiz_id, version: str) -> str:
+    return f"result_titles:{quiz_id}:{version}"
+
+
+def encode_titles(answer_key: AnswerKey, quiz_name: str, company_name: str) -> str:
+    return json.dumps(
+        [
+            quiz_name,
+            company_name,
+            [
+                [
+                    answer_key.question_titles[question_id],
+                    [
+                        answer_key.answer_titles[question_id][answer_id]
+                        for answer_id in answer_key.answer_order[question_id]
+                    ],
+                ]
+                for question_id in answer_key.question_order
+            ],
+        ],
+        separators=(",", ":"),
+    )
+
+
+def encode_result(answer_key: AnswerKey, answers: list[dict]) -> str:
+    # User, quiz and company ids are already in the record key.
+    question_index = {
+        question_id: index for index, question_id in enumerate(answer_key.question_order)
+    }
+    correct_mask = 0
+    rows = []
+    for position, answer in enumerate(answers):
+        question_id = answer["question_id"]
+        answer_order = answer_key.answer_order[question_id]
+        rows.append(
+            [question_index[question_id]]
+            + [answer_order.index(answer_id) for answer_id in answer["answer_ids"]]
+        )
+        if answer["is_correct"]:
+            correct_mask |= 1 << position
+
+    payload = json.dumps([answer_key.version, correct_mask, rows], separators=(",", ":"))
+    value = COMPACT_PREFIX + payload
+    if len(value) > config.RESULTS_COMPRESS_THRESHOLD:
+        compressed = COMPRESSED_PREFIX + base64.b64encode(
+            zlib.compress(payload.encode())
+        ).decode()
+        if len(compressed) < len(value):
+            return compressed
+    return value
+
+
+def decode_result(key: str, value: str) -> dict:
+    if value.startswith(COMPRESSED_PREFIX):
+        payload = zlib.decompress(base64.b64decode(value[len(COMPRESSED_PREFIX):]))
+    elif value.startswith(COMPACT_PREFIX):
+        payload = value[len(COMPACT_PREFIX):]
+    else:
+        # Records written before the compact format already carry resolved titles.
+        return json.loads(value)
+
+    version, correct_mask, rows = json.loads(payload)
+    user_id, quiz_id, _ = key.split(":")
+    return {
+        "user_id": user_id,
+        "quiz_id": quiz_id,
+        "version": version,
+        "answers": [
+            {
+                "question": row[0],
+                "answer": row[1:],
+                "is_correct": bool(correct_mask >> position & 1),
+            }
+            for position, row in enumerate(rows)
+        ],
+    }
+
+
+def resolve_record(record: dict, titles: Optional[list]) -> dict:
+    if titles is None:
+        quiz_name, company_name, questions = record["quiz_id"], "", []
+    else:
+        quiz_name, company_name, questions = titles
+
+    def title(question: int, answer: Optional[int] = None) -> str:
+        if question >= len(questions):
+            return f"#{question}" if answer is None else f"#{answer}"
+        question_title, answer_titles = questions[question]
+        return question_title if answer is None else answer_titles[answer]
+
+    return {
+        "user_id": record["user_id"],
+        "quiz_name": quiz_name,
+        "company_name": company_name,
+        "answers": [
+            {
+                "question": title(answer["question"]),
+                "answer": [title(answer["question"], index) for index in answer["answer"]],
+                "is_correct": answer["is_correct"],
+            }
+            for answer in record["answers"]
+        ],
+    }
+
+
+async def resolve_results(
+    chunks: AsyncIterator[list[dict]],
+) -> AsyncIterator[list[dict]]:
+    titles: dict[tuple[str, str], Optional[list]] = {}
+    async for chunk in chunks:
+        unknown = list(
+            {
+                (record["quiz_id"], record["version"])
+                for record in chunk
+                if "version" in record
+            }
+            - titles.keys()
+        )
+        if unknown:
+            redis = await get_redis_client()
+            values = await redis.mget([titles_key(*version) for version in unknown])
+            for version, value in zip(unknown, values):
+                if value is None:
+                    get_logger(__name__).warning(f"Result titles {version} are missing")
+                titles[version] = json.loads(value) if value else None
+        yield [
+            resolve_record(record, titles[(record["quiz_id"], record["version"])])
+            if "version" in record
+            else record
+            for record in chunk
+        ]
@@ -0,0 +1,129 @@
+import asyncio
+from typing import Callable, NamedTuple, Optional
+from uuid import UUID
+
+from app.core.settings import config
+from app.database.db import sessionmanager
+from app.entity.models import Result
+from app.repository.result import ResultRepository
+from logging_config import get_logger
+
+
+class PendingResult(NamedTuple):
+    row: dict
+    answers: list[dict]
+    company_id: UUID
+    future: asyncio.Future
+
+
+class ResultWriter:
+    def __init__(
+        self, session_factory: Callable, max_batch_size: int, max_latency: float
+    ):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.batches = 0
+        self.rows = 0
+        self.full_batches = 0
+        self.largest_batch = 0
+        self.failed_batches = 0
+        self.failed_rows = 0
+        self._pending: list[PendingResult] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def write(
+        self, row: dict, company_id: UUID, answers: Optional[list[dict]] = None
+    ) -> Result:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(PendingResult(row, answers or [], company_id, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency, self._flush_pending)
+        return await future
+
+    def _flush_pending(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _save(
+        self, batch: list[PendingResult]
+    ) -> tuple[Optional[list[Result]], Optional[Exception]]:
+        async with self.session_factory() as session:
+            try:
+                created = await ResultRepository(session).create_with_answers(
+                    [pending.row for pending in batch],
+                    [answer for pending in batch for answer in pending.answers],
+                    [pending.company_id for pending in batch],
+                )
+            except Exception as e:
+                await session.rollback()
+                return None, e
+        return created, None
+
+    async def _flush(self, batch: list[PendingResult]) -> None:
+        created, error = await self._save(batch)
+
+        self.batches += 1
+        self.rows += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        if len(batch) >= self.max_batch_size:
+            self.full_batches += 1
+
+        if error is None:
+            for pending, result in zip(batch, created):
+                if not pending.future.done():
+                    pending.future.set_result(result)
+            return
+
+        self.failed_batches += 1
+        get_logger(__name__).error(f"Can't save {len(batch)} results: {error}")
+        # Retry row by row so one bad submission does not fail the whole batch.
+        for pending in batch:
+            if len(batch) > 1:
+                created, error = await self._save([pending])
+            if pending.future.done():
+                continue
+            if error is not None:
+                self.failed_rows += 1
+                pending.future.set_exception(error)
+            else:
+                pending.future.set_result(created[0])
+
+    async def close(self) -> None:
+        self._flush_pending()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "rows": self.rows,
+            "average_batch_fill": round(self.rows / self.batches / self.max_batch_size, 3)
+            if self.batches
+            else 0.0,
+            "largest_batch": self.largest_batch,
+            "full_batches": self.full_batches,
+            "failed_batches": self.failed_batches,
+            "failed_rows": self.failed_rows,
+            "max_batch_size": self.max_batch_size,
+            "max_latency_ms": self.max_latency * 1000,
+        }
+
+
+result_writer = ResultWriter(
+    sessionmanager.session,
+    max_batch_size=config.RESULT_WRITER_BATCH_SIZE,
+    max_latency=config.RESULT_WRITER_MAX_LATENCY_MS / 1000,
+)
@@ -0,0 +1,70 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from uuid import UUID
+
+from app.core.settings import config
+
+
+class TokenCache:
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, Any]] = OrderedDict()
+        self._keys_by_user: dict[UUID, set[bytes]] = {}
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Any]:
+        key = self.digest(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                self._discard(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, token: str, principal: Any, expires_at: Optional[float]) -> None:
+        if self.maxsize <= 0:
+            return
+        max_expires_at = time.time() + self.ttl
+        expires_at = min(expires_at, max_expires_at) if expires_at else max_expires_at
+        key = self.digest(token)
+        self._discard(key)
+        self._entries[key] = (expires_at, principal)
+        self._keys_by_user.setdefault(principal.id, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        for key in self._keys_by_user.pop(user_id, set()):
+            self._entries.pop(key, None)
+
+    def _discard(self, key: bytes) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_keys = self._keys_by_user.get(entry[1].id)
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[entry[1].id]
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+token_cache = TokenCache(maxsize=config.TOKEN_CACHE_SIZE, ttl=config.TOKEN_CACHE_TTL)
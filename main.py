@@ -1,3 +1,4 @@
+import contextlib
 import uvicorn
 
 from fastapi import FastAPI
@@ -15,8 +16,24 @@ from app.routes import (
     quiz,
     analytics,
 )
+from app.database.redis_connector import redis_pool
+from app.utils.hash_password import Hash
+from app.utils.jwks import jwks_store
+from app.utils.result_writer import result_writer
 
-app = FastAPI()
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    await redis_pool.start()
+    await jwks_store.start()
+    yield
+    await jwks_store.stop()
+    await result_writer.close()
+    await redis_pool.close()
+    Hash.executor.shutdown(wait=False)
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(healthcheckers.router)
 app.include_router(users.router)
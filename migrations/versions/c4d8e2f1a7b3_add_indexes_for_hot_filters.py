@@ -0,0 +1,79 @@
+"""add indexes for hot filters
+
+Revision ID: c4d8e2f1a7b3
+Revises: 7e5c85e28b83
+Create Date: 2026-10-18 12:15:42.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2f1a7b3'
+down_revision: Union[str, None] = '7e5c85e28b83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_actions_company_id_user_id_status', 'actions', ['company_id', 'user_id', 'status']),
+    ('ix_quizzes_company_id', 'quizzes', ['company_id']),
+    ('ix_questions_quiz_id', 'questions', ['quiz_id']),
+    ('ix_answers_question_id_is_correct', 'answers', ['question_id', 'is_correct']),
+    ('ix_results_user_id_quiz_id_create_at', 'results', ['user_id', 'quiz_id', 'create_at']),
+    ('ix_notifications_user_id_status', 'notifications', ['user_id', 'status']),
+]
+
+
+def upgrade() -> None:
+    # A user has at most one action per company. If earlier races left
+    # duplicates behind, keep the strongest role first so ownership is never
+    # dropped, then the most recently updated row.
+    op.execute(
+        """
+        DELETE FROM actions
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY user_id, company_id
+                    ORDER BY
+                        CASE status
+                            WHEN 'OWNER' THEN 0
+                            WHEN 'ADMIN' THEN 1
+                            WHEN 'MEMBER' THEN 2
+                            ELSE 3
+                        END,
+                        update_at DESC,
+                        id DESC
+                ) AS position
+                FROM actions
+            ) ranked
+            WHERE position > 1
+        )
+        """
+    )
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        op.create_index(
+            'uq_actions_user_id_company_id',
+            'actions',
+            ['user_id', 'company_id'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+    op.execute(
+        'ALTER TABLE actions ADD CONSTRAINT uq_actions_user_id_company_id '
+        'UNIQUE USING INDEX uq_actions_user_id_company_id'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_actions_user_id_company_id', 'actions', type_='unique')
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
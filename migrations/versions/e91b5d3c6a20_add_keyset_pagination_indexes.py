@@ -0,0 +1,41 @@
+"""add keyset pagination indexes
+
+Revision ID: e91b5d3c6a20
+Revises: c4d8e2f1a7b3
+Create Date: 2026-10-18 13:02:17.604581
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b5d3c6a20'
+down_revision: Union[str, None] = 'c4d8e2f1a7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_users_create_at_id', 'users', ['create_at', 'id']),
+    ('ix_companies_create_at_id', 'companies', ['create_at', 'id']),
+    ('ix_quizzes_company_id_create_at_id', 'quizzes', ['company_id', 'create_at', 'id']),
+    ('ix_notifications_user_id_create_at_id', 'notifications', ['user_id', 'create_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        # Covered by the (company_id, create_at, id) index.
+        op.drop_index('ix_quizzes_company_id', table_name='quizzes', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_quizzes_company_id', 'quizzes', ['company_id'], unique=False, postgresql_concurrently=True)
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
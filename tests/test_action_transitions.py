@@ -0,0 +1,59 @@
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from app.entity.enums import ActionStatus
+from app.entity.models import Action, Company, User
+from app.repository.action import ActionRepository
+from app.services.action import ActionService
+from app.services.errors import UserForbidden
+
+
+@pytest_asyncio.fixture
+async def company(session):
+    owner = User(username="owner", email="owner@example.com", password="!")
+    member = User(username="member", email="member@example.com", password="!")
+    outsider = User(username="outsider", email="outsider@example.com", password="!")
+    company = Company(name="Company", description="Description")
+    session.add_all([owner, member, outsider, company])
+    await session.flush()
+    request = Action(
+        user_id=member.id,
+        company_id=company.id,
+        status=ActionStatus.REQUESTED_TO_JOIN,
+    )
+    session.add_all(
+        [
+            Action(user_id=owner.id, company_id=company.id, status=ActionStatus.OWNER),
+            request,
+        ]
+    )
+    await session.commit()
+    return company, owner, member, outsider, request
+
+
+@pytest.mark.asyncio
+async def test_transition_is_one_update(session, company, statements):
+    _, owner, _, _, request = company
+    service = ActionService(session, ActionRepository(session))
+    action = await service.accept_request(request.id, owner)
+    assert [s.split()[0] for s in statements] == ["UPDATE"]
+    assert action.status == ActionStatus.MEMBER
+
+
+@pytest.mark.asyncio
+async def test_transition_reports_status_message(session, company):
+    company, owner, member, _, _ = company
+    service = ActionService(session, ActionRepository(session))
+    await service.create_admin(company.id, member.id, owner)
+    with pytest.raises(HTTPException) as error:
+        await service.create_admin(company.id, member.id, owner)
+    assert error.value.detail == "You are admin this company"
+
+
+@pytest.mark.asyncio
+async def test_transition_requires_manager(session, company):
+    company, _, member, outsider, _ = company
+    service = ActionService(session, ActionRepository(session))
+    with pytest.raises(UserForbidden):
+        await service.remove_user(member.id, company.id, outsider)
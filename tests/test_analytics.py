@@ -0,0 +1,151 @@
+from datetime import date, datetime
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from uuid import uuid4
+
+from app.database.db import get_db
+from app.dtos.analytics import AnalyticResponse, AnalyticResponseMember
+from app.entity.enums import ActionStatus
+from app.entity.models import Action, Company, Quiz, Result, ResultDailyRollup, User
+from app.repository.analytics import AnalyticsRepository
+from app.repository.result import ResultRepository
+from app.services.auth import AuthService
+from main import app
+
+
+@pytest.mark.asyncio
+async def test_running_average_is_one_query(session, statements):
+    user_id = uuid4()
+    quiz = Quiz(
+        title="Quiz",
+        description="Description",
+        company=Company(name="Company", description="Description"),
+    )
+    session.add(quiz)
+    session.add_all(
+        [
+            Result(
+                user_id=user_id,
+                quiz=quiz,
+                correct_answers=1,
+                total_questions=1,
+                score_percentage=score,
+                create_at=datetime(2024, 1, day),
+            )
+            for day, score in ((3, 0), (1, 100), (2, 50))
+        ]
+    )
+    await session.commit()
+    statements.clear()
+
+    rows = await AnalyticsRepository(session).get_results_by_company(
+        user_id, quiz.company_id
+    )
+    assert len(statements) == 1
+    analytics = [AnalyticResponse.model_validate(row) for row in rows]
+    assert [a.score_percentage for a in analytics] == [100, 50, 0]
+    assert [a.average_score for a in analytics] == [100.0, 75.0, 50.0]
+    assert [a.quiz_name for a in analytics] == ["Quiz"] * 3
+
+
+@pytest.mark.asyncio
+async def test_analytics_routes_serialize_rows(session):
+    owner = User(username="owner", email="owner@example.com", password="!")
+    company = Company(name="Company", description="Description")
+    session.add_all([owner, company])
+    await session.flush()
+    quiz = Quiz(title="Quiz", description="Description", company_id=company.id)
+    session.add_all(
+        [
+            Action(user_id=owner.id, company_id=company.id, status=ActionStatus.OWNER),
+            quiz,
+        ]
+    )
+    await session.commit()
+    await ResultRepository(session).create_with_answers(
+        [
+            {
+                "user_id": owner.id,
+                "quiz_id": quiz.id,
+                "correct_answers": 1,
+                "total_questions": 2,
+                "score_percentage": score,
+                "create_at": datetime(2024, 1, day),
+            }
+            for day, score in ((1, 100), (2, 50))
+        ],
+        [],
+        [company.id, company.id],
+    )
+
+    app.dependency_overrides[get_db] = lambda: session
+    app.dependency_overrides[AuthService.get_current_user] = lambda: owner
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            members = await client.get(
+                f"/analytics/members/{owner.id}", params={"company_id": str(company.id)}
+            )
+            system = await client.get(f"/result/system/{owner.id}")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert members.status_code == 200
+    assert [row["average_score"] for row in members.json()] == [100.0, 75.0]
+    assert system.status_code == 200
+    assert system.json() == {"average_percentage_system": 75.0}
+
+
+@pytest.mark.asyncio
+async def test_members_by_date_sums_whole_days(session):
+    company_id, other_company_id, quiz_id = uuid4(), uuid4(), uuid4()
+    first, second = uuid4(), uuid4()
+    session.add_all(
+        [
+            ResultDailyRollup(
+                company_id=company,
+                quiz_id=quiz_id,
+                user_id=user_id,
+                day=date(2024, 1, day),
+                attempts=attempts,
+                score_sum=score_sum,
+                score_min=score_min,
+                score_max=score_max,
+            )
+            for company, user_id, day, attempts, score_sum, score_min, score_max in (
+                (company_id, first, 1, 5, 500, 100, 100),
+                (company_id, first, 2, 2, 100, 20, 80),
+                (company_id, first, 3, 1, 50, 50, 50),
+                (company_id, second, 3, 1, 0, 0, 0),
+                (company_id, second, 4, 4, 400, 100, 100),
+                (other_company_id, first, 2, 3, 300, 100, 100),
+            )
+        ]
+    )
+    await session.commit()
+
+    rows = await AnalyticsRepository(session).get_result_members_by_date(
+        date(2024, 1, 2), date(2024, 1, 4), company_id
+    )
+    members = {
+        row.user_id: AnalyticResponseMember.model_validate(row).model_dump()
+        for row in rows
+    }
+    assert members == {
+        first: {
+            "user_id": first,
+            "attempts": 3,
+            "average_score": 50.0,
+            "min_score": 20,
+            "max_score": 80,
+        },
+        second: {
+            "user_id": second,
+            "attempts": 1,
+            "average_score": 0.0,
+            "min_score": 0,
+            "max_score": 0,
+        },
+    }
@@ -0,0 +1,69 @@
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from app.dtos.result import ResultSchema
+from app.entity.models import Answer, Company, Question, Quiz
+from app.repository.quiz import QuizRepository
+from app.utils.answer_key import AnswerKey
+
+
+@pytest_asyncio.fixture
+async def quiz(session):
+    quiz = Quiz(
+        title="Quiz",
+        description="Description",
+        company=Company(name="Company", description="Description"),
+        questions=[
+            Question(
+                title=f"Question {i}",
+                answers=[
+                    Answer(title="Yes", is_correct=True),
+                    Answer(title="Also yes", is_correct=True),
+                    Answer(title="No", is_correct=False),
+                ],
+            )
+            for i in range(3)
+        ],
+    )
+    session.add(quiz)
+    await session.commit()
+    return quiz
+
+
+@pytest.mark.asyncio
+async def test_answer_key_is_one_query_and_grades(session, quiz, statements):
+    answer_key = await QuizRepository(session).get_answer_key(quiz.id, "v1")
+    assert len(statements) == 1
+
+    first, second, _ = quiz.questions
+    yes, also_yes, no = first.answers
+    correct_count, detailed = answer_key.grade(
+        [
+            ResultSchema(question_id=first.id, answer_id=[also_yes.id, yes.id]),
+            ResultSchema(question_id=second.id, answer_id=[second.answers[0].id]),
+        ]
+    )
+    assert len(statements) == 1
+    assert answer_key.total_questions == 3
+    assert correct_count == 1
+    assert detailed[0] == {
+        "question_id": first.id,
+        "answer_ids": [also_yes.id, yes.id],
+        "question": "Question 0",
+        "answer": ["Also yes", "Yes"],
+        "is_correct": True,
+    }
+    assert AnswerKey.from_json(answer_key.to_json()) == answer_key
+
+
+@pytest.mark.asyncio
+async def test_answer_key_rejects_foreign_ids(session, quiz):
+    answer_key = await QuizRepository(session).get_answer_key(quiz.id, "v1")
+    first, second, _ = quiz.questions
+    with pytest.raises(HTTPException):
+        answer_key.grade([ResultSchema(question_id=quiz.id, answer_id=[])])
+    with pytest.raises(HTTPException):
+        answer_key.grade(
+            [ResultSchema(question_id=first.id, answer_id=[second.answers[0].id])]
+        )
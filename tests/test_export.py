@@ -0,0 +1,151 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.settings import config
+from app.entity.enums import ExportStatus
+from app.utils import celery_worker
+from app.utils.celery_worker import export_results_async
+from app.utils.export import (
+    export_artifact_path,
+    parse_range,
+    ranged_file_response,
+    stream_export,
+)
+from app.utils.redis import Redis
+
+ITEM = {
+    "user_id": "u1",
+    "company_name": "Company",
+    "quiz_name": "Quiz",
+    "answers": [
+        {"question": "Q1", "answer": ["A", "B"], "is_correct": True},
+        {"question": "Q2", "answer": ["C"], "is_correct": False},
+    ],
+}
+
+
+async def chunks(count: int):
+    for _ in range(count):
+        yield [ITEM, ITEM]
+
+
+async def body(response) -> str:
+    return "".join([part async for part in response.body_iterator])
+
+
+@pytest.mark.asyncio
+async def test_stream_export_formats():
+    rows = list(csv.reader(io.StringIO(await body(stream_export(chunks(3), "csv")))))
+    assert rows[0][0] == "user_id"
+    assert rows[1] == ["u1", "Company", "Quiz", "Q1", "A, B", "True"]
+    assert len(rows) == 1 + 3 * 2 * 2
+
+    assert json.loads(await body(stream_export(chunks(3), "json"))) == [ITEM] * 6
+    assert json.loads(await body(stream_export(chunks(0), "json"))) == []
+
+    lines = (await body(stream_export(chunks(2), "ndjson"))).splitlines()
+    assert [json.loads(line) for line in lines] == [ITEM] * 4
+
+
+def test_stream_export_rejects_unknown_format():
+    with pytest.raises(HTTPException) as error:
+        stream_export(chunks(1), "xml")
+    assert error.value.status_code == 400
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    assert parse_range("bytes=10-", 100) == (10, 99)
+    assert parse_range("bytes=10-500", 100) == (10, 99)
+    assert parse_range("bytes=-20", 100) == (80, 99)
+    with pytest.raises(HTTPException) as error:
+        parse_range("bytes=100-", 100)
+    assert error.value.status_code == 416
+
+
+async def save_legacy_results(redis, company_id: str, count: int):
+    index_key = Redis.company_results_key(company_id)
+    for i in range(count):
+        key = Redis.result_key(f"user{i}", "quiz", company_id)
+        await redis.set(key, json.dumps({**ITEM, "user_id": f"user{i}"}))
+        await redis.zadd(index_key, {key: i})
+
+
+@pytest.mark.asyncio
+async def test_export_jobs_are_reused_until_they_fail(fake_redis):
+    first, created = await Redis.create_export_job("company", "csv")
+    assert created
+    again, created = await Redis.create_export_job("company", "csv")
+    assert not created and again["id"] == first["id"]
+    other, created = await Redis.create_export_job("company", "json")
+    assert created and other["id"] != first["id"]
+
+    await Redis.update_export_job(first["id"], status=ExportStatus.FAILED.value)
+    retried, created = await Redis.create_export_job("company", "csv")
+    assert created and retried["id"] != first["id"]
+
+    # A worker that stopped sending heartbeats no longer blocks new jobs.
+    await Redis.update_export_job(
+        retried["id"], status=ExportStatus.RUNNING.value, heartbeat_at=0
+    )
+    replaced, created = await Redis.create_export_job("company", "csv")
+    assert created and replaced["id"] != retried["id"]
+    assert (await Redis.get_export_job(retried["id"]))["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_export_job_writes_artifact(fake_redis, monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "RESULTS_EXPORT_CHUNK", 2)
+    await save_legacy_results(fake_redis, "company", 5)
+    job, _ = await Redis.create_export_job("company", "ndjson")
+
+    await export_results_async(job["id"])
+
+    job = await Redis.get_export_job(job["id"])
+    assert job["status"] == ExportStatus.DONE.value
+    assert (job["processed"], job["total"]) == ("5", "5")
+    path = export_artifact_path(job["id"], "ndjson")
+    lines = gzip.decompress(path.read_bytes()).decode().splitlines()
+    assert [json.loads(line)["user_id"] for line in lines] == [f"user{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_export_job_records_failure(fake_redis, monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "EXPORT_DIR", str(tmp_path))
+
+    async def broken(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(celery_worker, "write_export_artifact", broken)
+    job, _ = await Redis.create_export_job("company", "csv")
+
+    await export_results_async(job["id"])
+
+    job = await Redis.get_export_job(job["id"])
+    assert job["status"] == ExportStatus.FAILED.value
+    assert job["error"] == "disk full"
+
+
+@pytest.mark.asyncio
+async def test_ranged_file_response(tmp_path):
+    path = tmp_path / "export.csv.gz"
+    content = bytes(range(256)) * 1024
+    path.write_bytes(content)
+
+    response = ranged_file_response(path, "bytes=1000-70999", path.name)
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 1000-70999/{len(content)}"
+    assert response.headers["content-length"] == "70000"
+    assert response.headers["accept-ranges"] == "bytes"
+    body = b"".join([part async for part in response.body_iterator])
+    assert body == content[1000:71000]
+
+    response = ranged_file_response(path, None, path.name)
+    assert response.status_code == 200
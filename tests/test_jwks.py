@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.utils.jwks import JWKSKeyStore
+
+
+class StubKeyStore(JWKSKeyStore):
+    def __init__(self, responses: list, **kwargs):
+        super().__init__(
+            "https://example.com/.well-known/jwks.json",
+            **{"ttl": 60, "min_refetch_interval": 10, "timeout": 1.0, **kwargs},
+        )
+        self.responses = responses
+        self.fetches = 0
+
+    async def fetch(self) -> None:
+        self.fetches += 1
+        await asyncio.sleep(0)
+        if self.responses:
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            self._keys = response
+        self._fetched_at = time.monotonic()
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_triggers_one_refetch():
+    store = StubKeyStore([{"new": "key"}])
+    keys = await asyncio.gather(*(store.get_signing_key("new") for _ in range(5)))
+    assert keys == ["key"] * 5
+    assert store.fetches == 1
+
+
+@pytest.mark.asyncio
+async def test_refetch_is_rate_limited():
+    store = StubKeyStore([{"a": "key"}, {"b": "key"}])
+    assert await store.get_signing_key("b") is None
+    assert await store.get_signing_key("b") is None
+    assert store.fetches == 1
+
+    store._attempted_at -= store.min_refetch_interval
+    assert await store.get_signing_key("b") == "key"
+    assert store.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_keys_survive_failed_fetch():
+    store = StubKeyStore([{"a": "key"}, httpx.ConnectError("down")], ttl=0)
+    await store.start()
+    await store.stop()
+    store._attempted_at -= store.min_refetch_interval
+
+    assert store.is_stale
+    assert await store.get_signing_key("a") == "key"
+    assert store.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_background_refresh():
+    store = StubKeyStore([{"a": "old"}, {"a": "new"}], ttl=0.02)
+    await store.start()
+    try:
+        await asyncio.sleep(0.05)
+    finally:
+        await store.stop()
+    assert store.fetches >= 2
+    assert store._keys == {"a": "new"}
@@ -0,0 +1,67 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.exc import InvalidRequestError
+
+from app.entity.models import Answer, Company, Question, Quiz
+from app.repository.quiz import QuizRepository
+
+
+@pytest_asyncio.fixture
+async def quiz(session):
+    company = Company(name="Company", description="Description")
+    quiz = Quiz(
+        title="Quiz",
+        description="Description",
+        company=company,
+        questions=[
+            Question(
+                title=f"Question {i}",
+                answers=[
+                    Answer(title="Yes", is_correct=True),
+                    Answer(title="No", is_correct=False),
+                ],
+            )
+            for i in range(5)
+        ],
+    )
+    session.add(quiz)
+    await session.commit()
+    session.expunge_all()
+    return quiz
+
+
+@pytest.mark.asyncio
+async def test_relationships_are_not_loaded_by_default(session, quiz, statements):
+    loaded = await QuizRepository(session).get_one(id=quiz.id)
+    assert len(statements) == 1
+    with pytest.raises(InvalidRequestError):
+        loaded.questions
+
+
+@pytest.mark.asyncio
+async def test_quiz_with_questions_profile(session, quiz, statements):
+    loaded = await QuizRepository(session).get_one(
+        id=quiz.id, profile="quiz_with_questions"
+    )
+    assert len(statements) == 3
+    assert len(loaded.questions) == 5
+    assert all(len(question.answers) == 2 for question in loaded.questions)
+    assert len(statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_quiz_with_company_profile(session, quiz, statements):
+    loaded = await QuizRepository(session).get_one_or_404(
+        {"id": quiz.id}, profile="quiz_with_company"
+    )
+    assert len(statements) == 1
+    assert loaded.company.name == "Company"
+
+
+@pytest.mark.asyncio
+async def test_profile_applies_to_every_row(session, quiz, statements):
+    quizzes = await QuizRepository(session).get_many_by_params(
+        company_id=quiz.company_id, profile="quiz_with_questions"
+    )
+    assert len(statements) == 3
+    assert [len(q.questions) for q in quizzes] == [5]
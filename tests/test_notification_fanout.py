@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.settings import config
+from app.database.db import DatabaseSessionManager
+from app.utils import celery_worker
+from app.utils.celery_worker import fan_out_quiz_notifications
+
+
+class FailingSession:
+    def __init__(self, chunks: list[list]):
+        self.chunks = chunks
+        self.rolled_back = False
+
+    async def execute(self, stmt, *args):
+        if not hasattr(self, "quiz_loaded"):
+            self.quiz_loaded = True
+            quiz = SimpleNamespace(title="Quiz", company_id=uuid4(), name="Company")
+            return SimpleNamespace(one_or_none=lambda: quiz)
+        if not self.chunks:
+            raise RuntimeError("connection lost")
+        user_ids = self.chunks.pop(0)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: user_ids))
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        self.rolled_back = True
+
+    async def close(self):
+        pass
+
+
+class Retry(Exception):
+    pass
+
+
+def test_fan_out_retries_from_last_committed_chunk(monkeypatch):
+    committed = sorted(uuid4() for _ in range(2))
+    session = FailingSession([committed])
+    manager = DatabaseSessionManager.__new__(DatabaseSessionManager)
+    manager._session_maker = lambda: session
+    monkeypatch.setattr(celery_worker, "sessionmanager", manager)
+    monkeypatch.setattr(config, "NOTIFICATION_FANOUT_CHUNK", 2)
+
+    retries = []
+
+    def retry(**kwargs):
+        retries.append(kwargs)
+        return Retry()
+
+    monkeypatch.setattr(fan_out_quiz_notifications, "retry", retry)
+    quiz_id = str(uuid4())
+    with pytest.raises(Retry):
+        fan_out_quiz_notifications(quiz_id)
+
+    assert session.rolled_back
+    assert retries[0]["kwargs"] == {
+        "quiz_id": quiz_id,
+        "after_user_id": str(committed[-1]),
+    }
@@ -0,0 +1,125 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.db import DatabaseSessionManager
+from app.dtos.quiz import QuizSchema
+from app.dtos.result import ResultSchema
+from app.entity.enums import ActionStatus
+from app.entity.models import Action, Company, Quiz, User
+from app.repository.action import ActionRepository
+from app.repository.answer import AnswerRepository
+from app.repository.question import QuestionRepository
+from app.repository.quiz import QuizRepository
+from app.repository.result import ResultRepository
+from app.services import result as result_service_module
+from app.services.errors import UserForbidden
+from app.services.quiz import QuizService
+from app.services.result import ResultService
+from app.utils import celery_worker
+from app.utils.redis import Redis
+
+
+async def fake_write(row, company_id, answers=None):
+    return SimpleNamespace(**row)
+
+
+@pytest.mark.asyncio
+async def test_ranking_keeps_flushed_frequencies(session, fake_redis, monkeypatch):
+    monkeypatch.setattr(result_service_module.result_writer, "write", fake_write)
+    owner = User(username="owner", email="owner@example.com", password="!")
+    company = Company(name="Company", description="Description")
+    session.add_all([owner, company])
+    await session.flush()
+    session.add(Action(user_id=owner.id, company_id=company.id, status=ActionStatus.OWNER))
+    await session.commit()
+
+    quiz_repository = QuizRepository(session)
+    body = QuizSchema(
+        title="Quiz",
+        description="Description",
+        questions=[
+            {
+                "title": f"Question {i}",
+                "answers": [
+                    {"title": "Yes", "is_correct": True},
+                    {"title": "No", "is_correct": False},
+                ],
+            }
+            for i in range(2)
+        ],
+    )
+    popular = await quiz_repository.create_graph(company.id, body)
+    rare = await quiz_repository.create_graph(company.id, body)
+    for quiz, frequency in ((popular, 10), (rare, 3)):
+        (await session.get(Quiz, quiz.id)).frequency = frequency
+    await session.commit()
+
+    result_service = ResultService(
+        session,
+        ResultRepository(session),
+        quiz_repository,
+        AnswerRepository(session),
+        ActionRepository(session),
+        QuestionRepository(session),
+    )
+    answers = [
+        ResultSchema(question_id=question.id, answer_id=[question.answers[0].id])
+        for question in rare.questions
+    ]
+    for _ in range(2):
+        await result_service.submit_quiz(rare.id, owner.id, answers)
+
+    quiz_service = QuizService(
+        session, quiz_repository, ActionRepository(session), None, None, None, None
+    )
+    ranking = await quiz_service.get_popular_quizzes(company.id, owner)
+    assert [(item["id"], item["attempts"]) for item in ranking] == [
+        (str(popular.id), 10),
+        (str(rare.id), 5),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ranking_requires_owner_or_admin(session, fake_redis):
+    outsider = User(username="outsider", email="outsider@example.com", password="!")
+    company = Company(name="Company", description="Description")
+    session.add_all([outsider, company])
+    await session.commit()
+
+    quiz_service = QuizService(
+        session, QuizRepository(session), ActionRepository(session), None, None, None, None
+    )
+    with pytest.raises(UserForbidden):
+        await quiz_service.get_popular_quizzes(company.id, outsider)
+
+
+@pytest.mark.asyncio
+async def test_flush_keeps_quiz_update_at(engine, session, fake_redis, monkeypatch):
+    manager = DatabaseSessionManager.__new__(DatabaseSessionManager)
+    manager._session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    monkeypatch.setattr(celery_worker, "sessionmanager", manager)
+    company = Company(name="Company", description="Description")
+    session.add(company)
+    await session.flush()
+    update_at = datetime(2024, 1, 1)
+    quiz = Quiz(
+        title="Quiz",
+        description="Description",
+        company_id=company.id,
+        frequency=1,
+        update_at=update_at,
+    )
+    session.add(quiz)
+    await session.commit()
+
+    for _ in range(2):
+        await Redis.record_quiz_attempt(quiz.id, company.id)
+    await celery_worker.flush_quiz_attempts_async()
+
+    await session.refresh(quiz)
+    assert quiz.frequency == 3
+    assert quiz.update_at == update_at
+    assert await Redis.get_pending_quiz_attempts() == {}
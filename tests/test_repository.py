@@ -0,0 +1,131 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.dtos.quiz import QuizSchema
+from app.entity.models import Company, User
+from app.repository.quiz import QuizRepository
+from app.repository.users import UserRepository
+from app.services.errors import ErrorNotFound
+
+
+@pytest.mark.asyncio
+async def test_get_page_walks_every_row_once(session):
+    repository = UserRepository(session)
+    for i in range(5):
+        await repository.create(
+            {
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "password": "!",
+                # Two rows share a timestamp so the id tie-break is exercised.
+                "create_at": datetime(2024, 1, 1, 0, 0, i // 2),
+            }
+        )
+
+    seen = []
+    cursor = None
+    while True:
+        page = await repository.get_page(cursor, limit=2)
+        assert len(page["items"]) <= 2
+        seen.extend(user.username for user in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == [f"user{i}" for i in range(5)]
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.asyncio
+async def test_get_page_enforces_max_page_size(session, monkeypatch):
+    monkeypatch.setattr("app.core.settings.config.PAGE_SIZE_MAX", 3)
+    session.add_all(
+        User(
+            username=f"user{i}",
+            email=f"user{i}@example.com",
+            password="!",
+            create_at=datetime(2024, 1, 1, 0, 0, i),
+        )
+        for i in range(5)
+    )
+    await session.commit()
+    page = await UserRepository(session).get_page(limit=1000)
+    assert len(page["items"]) == 3
+    assert page["next_cursor"] is not None
+
+
+@pytest.mark.asyncio
+async def test_create_many_is_one_insert(session, statements):
+    users = await UserRepository(session).create_many(
+        [
+            User(username=f"user{i}", email=f"user{i}@example.com", password="!")
+            for i in range(3)
+        ]
+        + [{"username": "user3", "email": "user3@example.com", "password": "!"}]
+    )
+    inserts = [s for s in statements if s.startswith("INSERT")]
+    assert len(inserts) == 1
+    assert [user.username for user in users] == [f"user{i}" for i in range(4)]
+    assert all(user.id and user.create_at for user in users)
+
+
+@pytest.mark.asyncio
+async def test_update_is_one_statement(session, statements):
+    repository = UserRepository(session)
+    user = await repository.create(
+        {"username": "user", "email": "user@example.com", "password": "!"}
+    )
+    statements.clear()
+    updated = await repository.update(
+        user.id, {"username": "renamed", "password": None}, User.email == user.email
+    )
+    assert [s.split()[0] for s in statements] == ["UPDATE"]
+    assert updated.username == "renamed"
+    assert updated.password == "!"
+
+
+@pytest.mark.asyncio
+async def test_update_without_matching_row_is_not_found(session):
+    repository = UserRepository(session)
+    user = await repository.create(
+        {"username": "user", "email": "user@example.com", "password": "!"}
+    )
+    with pytest.raises(ErrorNotFound):
+        await repository.update(uuid4(), {"username": "renamed"})
+    with pytest.raises(ErrorNotFound):
+        await repository.update(
+            user.id, {"username": "renamed"}, User.email == "other@example.com"
+        )
+
+
+@pytest.mark.asyncio
+async def test_create_quiz_graph_is_three_inserts(session, statements):
+    company = Company(name="Company", description="Description")
+    session.add(company)
+    await session.commit()
+    statements.clear()
+
+    body = QuizSchema(
+        title="Quiz",
+        description="Description",
+        questions=[
+            {
+                "title": f"Question {i}",
+                "answers": [
+                    {"title": "Yes", "is_correct": True},
+                    {"title": "No", "is_correct": False},
+                ],
+            }
+            for i in range(50)
+        ],
+    )
+    created = await QuizRepository(session).create_graph(company.id, body)
+    assert [s.split()[0] for s in statements] == ["INSERT"] * 3
+    assert len(created.questions) == 50
+
+    loaded = await QuizRepository(session).get_one(
+        id=created.id, profile="quiz_with_questions"
+    )
+    assert {q.id for q in loaded.questions} == {q.id for q in created.questions}
+    assert sum(len(q.answers) for q in loaded.questions) == 100
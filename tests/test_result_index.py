@@ -0,0 +1,30 @@
+import json
+import time
+
+import pytest
+
+from app.core.settings import config
+from app.utils.redis import Redis
+
+
+@pytest.mark.asyncio
+async def test_iter_results_survives_concurrent_saves(fake_redis, monkeypatch):
+    monkeypatch.setattr(config, "RESULTS_EXPORT_CHUNK", 2)
+    index_key = Redis.company_results_key("company")
+    now = time.time()
+    # Three keys share a score so paging has to break ties by member.
+    scores = {f"user{i}:quiz:company": now - 100 + min(i, 3) for i in range(8)}
+    await fake_redis.zadd(index_key, scores)
+    await fake_redis.mset(
+        {key: json.dumps({"user_id": key.split(":")[0]}) for key in scores}
+    )
+
+    seen = []
+    async for chunk in Redis.iter_results(index_key):
+        seen.extend(item["user_id"] for item in chunk)
+        if len(seen) == 4:
+            # A resubmission moves a key to the tail, an expiry trims the head.
+            await fake_redis.zadd(index_key, {"user0:quiz:company": time.time() + 1})
+            await fake_redis.zremrangebyscore(index_key, "-inf", now - 100)
+
+    assert seen == [f"user{i}" for i in range(8)]
@@ -0,0 +1,104 @@
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.utils.answer_key import AnswerKey
+from app.utils.result_records import (
+    COMPACT_PREFIX,
+    COMPRESSED_PREFIX,
+    decode_result,
+    encode_result,
+    encode_titles,
+    resolve_results,
+    titles_key,
+)
+
+
+def answer_key(version: str, questions: int = 10) -> AnswerKey:
+    answer_titles = {
+        uuid4(): {uuid4(): f"Answer option {i} for this question" for i in range(4)}
+        for _ in range(questions)
+    }
+    return AnswerKey(
+        quiz_id=uuid4(),
+        version=version,
+        correct={
+            question_id: frozenset(list(titles)[:1])
+            for question_id, titles in answer_titles.items()
+        },
+        question_titles={
+            question_id: f"A long question title number {i} about something"
+            for i, question_id in enumerate(answer_titles)
+        },
+        answer_titles=answer_titles,
+    )
+
+
+def graded(key: AnswerKey) -> list[dict]:
+    answers_input = [
+        SimpleNamespace(question_id=question_id, answer_id=list(titles)[: 1 + i % 2])
+        for i, (question_id, titles) in enumerate(key.answer_titles.items())
+    ]
+    _, detailed = key.grade(answers_input)
+    return detailed
+
+
+async def resolve(records: list[dict]) -> list[dict]:
+    async def chunks():
+        yield records
+
+    return [item async for chunk in resolve_results(chunks()) for item in chunk]
+
+
+@pytest.mark.asyncio
+async def test_compact_record_resolves_titles_of_its_version(fake_redis):
+    key = answer_key("2024-01-01T00:00:00")
+    detailed = graded(key)
+    record_key = f"{uuid4()}:{key.quiz_id}:{uuid4()}"
+    value = encode_result(key, detailed)
+    await fake_redis.set(
+        titles_key(key.quiz_id, key.version), encode_titles(key, "Quiz", "Company")
+    )
+    # The quiz is edited afterwards; the record keeps pointing at its own version.
+    edited = answer_key("2024-02-01T00:00:00")
+    await fake_redis.set(
+        titles_key(key.quiz_id, edited.version), encode_titles(edited, "Edited", "Company")
+    )
+
+    [item] = await resolve([decode_result(record_key, value)])
+    expected = {
+        "user_id": record_key.split(":")[0],
+        "quiz_name": "Quiz",
+        "company_name": "Company",
+        "answers": [
+            {
+                "question": answer["question"],
+                "answer": answer["answer"],
+                "is_correct": answer["is_correct"],
+            }
+            for answer in detailed
+        ],
+    }
+    assert item == expected
+    assert value.startswith(COMPACT_PREFIX)
+    assert len(value) * 4 < len(json.dumps(expected))
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_record_passes_through(fake_redis):
+    legacy = {"user_id": "u1", "quiz_name": "Quiz", "company_name": "Company", "answers": []}
+    record = decode_result("u1:quiz:company", json.dumps(legacy))
+    assert await resolve([record]) == [legacy]
+
+
+def test_large_record_is_compressed():
+    key = answer_key("2024-01-01T00:00:00", questions=300)
+    detailed = graded(key)
+    value = encode_result(key, detailed)
+    assert value.startswith(COMPRESSED_PREFIX)
+    record = decode_result(f"user:{key.quiz_id}:company", value)
+    assert [answer["is_correct"] for answer in record["answers"]] == [
+        answer["is_correct"] for answer in detailed
+    ]
@@ -0,0 +1,181 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.dtos.quiz import QuizSchema
+from app.dtos.result import ResultSchema
+from app.entity.enums import ActionStatus
+from app.entity.models import Action, Base, Company, User
+from app.repository.action import ActionRepository
+from app.repository.answer import AnswerRepository
+from app.repository.question import QuestionRepository
+from app.repository.quiz import QuizRepository
+from app.repository.result import ResultRepository
+from app.services import result as result_service_module
+from app.services.result import ResultService
+from app.utils.result_writer import ResultWriter
+
+
+def result_row(user_id=None, quiz_id=None, score_percentage=50):
+    return {
+        "user_id": user_id or uuid4(),
+        "quiz_id": quiz_id or uuid4(),
+        "correct_answers": 1,
+        "total_questions": 2,
+        "score_percentage": score_percentage,
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_inserts(engine, statements):
+    writer = ResultWriter(
+        async_sessionmaker(bind=engine, expire_on_commit=False),
+        max_batch_size=3,
+        max_latency=0.05,
+    )
+    rows = [result_row() for _ in range(5)]
+    results = await asyncio.gather(*(writer.write(row, uuid4()) for row in rows))
+
+    # Results and their score aggregates, once per batch.
+    assert [s.split()[0] for s in statements] == ["INSERT"] * 4
+    assert [result.user_id for result in results] == [row["user_id"] for row in rows]
+    assert all(result.id for result in results)
+    assert writer.stats()["batches"] == 2
+    assert writer.stats()["full_batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_rows(engine):
+    writer = ResultWriter(
+        async_sessionmaker(bind=engine, expire_on_commit=False),
+        max_batch_size=100,
+        max_latency=60,
+    )
+    pending = asyncio.ensure_future(writer.write(result_row(), uuid4()))
+    await asyncio.sleep(0)
+    await writer.close()
+    assert (await pending).id
+
+
+@pytest.mark.asyncio
+async def test_batches_maintain_score_aggregates(engine, session):
+    writer = ResultWriter(
+        async_sessionmaker(bind=engine, expire_on_commit=False),
+        max_batch_size=2,
+        max_latency=0.05,
+    )
+    user_id, quiz_id, company_id = uuid4(), uuid4(), uuid4()
+    await asyncio.gather(
+        *(
+            writer.write(result_row(user_id, quiz_id, score), company_id)
+            for score in (100, 50, 30)
+        )
+    )
+    await writer.write(result_row(user_id, score_percentage=0), uuid4())
+
+    repository = ResultRepository(session)
+    assert await repository.get_average_score(user_id, company_id) == 60
+    assert await repository.get_average_score(user_id) == 45
+    assert await repository.get_average_score(uuid4()) is None
+
+
+@pytest.mark.asyncio
+async def test_failing_row_does_not_fail_its_batch(engine):
+    writer = ResultWriter(
+        async_sessionmaker(bind=engine, expire_on_commit=False),
+        max_batch_size=3,
+        max_latency=0.05,
+    )
+    existing = await writer.write(result_row(), uuid4())
+    duplicate = {**result_row(), "id": existing.id}
+    results = await asyncio.gather(
+        writer.write(result_row(), uuid4()),
+        writer.write(duplicate, uuid4()),
+        writer.write(result_row(), uuid4()),
+        return_exceptions=True,
+    )
+
+    assert results[0].id and results[2].id
+    assert isinstance(results[1], IntegrityError)
+    assert writer.stats()["failed_batches"] == 1
+    assert writer.stats()["failed_rows"] == 1
+
+
+@pytest.mark.asyncio
+async def test_submissions_release_connection_before_waiting(tmp_path, fake_redis, monkeypatch):
+    # Every request session and the writer share one small pool, as in the app.
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'results.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=1,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    writer = ResultWriter(session_maker, max_batch_size=2, max_latency=0.05)
+    monkeypatch.setattr(result_service_module, "result_writer", writer)
+
+    async with session_maker() as session:
+        company = Company(name="Company", description="Description")
+        users = [
+            User(username=f"user{i}", email=f"user{i}@example.com", password="!")
+            for i in range(2)
+        ]
+        session.add_all([company, *users])
+        await session.flush()
+        session.add_all(
+            Action(user_id=user.id, company_id=company.id, status=ActionStatus.MEMBER)
+            for user in users
+        )
+        quiz = await QuizRepository(session).create_graph(
+            company.id,
+            QuizSchema(
+                title="Quiz",
+                description="Description",
+                questions=[
+                    {
+                        "title": f"Question {i}",
+                        "answers": [
+                            {"title": "Yes", "is_correct": True},
+                            {"title": "No", "is_correct": False},
+                        ],
+                    }
+                    for i in range(2)
+                ],
+            ),
+        )
+        await session.commit()
+    answers = [
+        ResultSchema(question_id=question.id, answer_id=[question.answers[0].id])
+        for question in quiz.questions
+    ]
+
+    async def submit(user):
+        # Each request keeps its get_db session open until the response is sent.
+        async with session_maker() as db:
+            service = ResultService(
+                db,
+                ResultRepository(db),
+                QuizRepository(db),
+                AnswerRepository(db),
+                ActionRepository(db),
+                QuestionRepository(db),
+            )
+            return await service.submit_quiz(quiz.id, user.id, answers)
+
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*(submit(user) for user in users)), timeout=5
+        )
+    finally:
+        await engine.dispose()
+
+    assert [result.user_id for result in results] == [user.id for user in users]
+    assert writer.stats()["batches"] == 1
+    assert writer.stats()["failed_batches"] == 0
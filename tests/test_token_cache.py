@@ -0,0 +1,42 @@
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.utils.token_cache import TokenCache
+
+
+def test_token_cache_hit_and_miss():
+    cache = TokenCache(maxsize=10, ttl=60)
+    user = SimpleNamespace(id=uuid4())
+    assert cache.get("token") is None
+    cache.set("token", user, time.time() + 30)
+    assert cache.get("token") is user
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_token_cache_expires_with_token():
+    cache = TokenCache(maxsize=10, ttl=60)
+    cache.set("token", SimpleNamespace(id=uuid4()), time.time() - 1)
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(maxsize=2, ttl=60)
+    cache.set("first", SimpleNamespace(id=uuid4()), None)
+    cache.set("second", SimpleNamespace(id=uuid4()), None)
+    cache.get("first")
+    cache.set("third", SimpleNamespace(id=uuid4()), None)
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+
+
+def test_token_cache_invalidate_user():
+    cache = TokenCache(maxsize=10, ttl=60)
+    user = SimpleNamespace(id=uuid4())
+    cache.set("web", user, None)
+    cache.set("mobile", user, None)
+    cache.invalidate_user(user.id)
+    assert cache.get("web") is None
+    assert cache.get("mobile") is None